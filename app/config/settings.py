@@ -3,7 +3,7 @@ Configurações centralizadas da aplicação Sentinela
 """
 import os
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, List
 from .secrets_manager import secrets_manager
 
 
@@ -133,13 +133,13 @@ class FileUploadConfig:
     # Tamanho máximo de arquivo (10MB)
     max_file_size_bytes: int = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))
     
-    # Extensões permitidas
-    allowed_extensions: Set[str] = field(default_factory=lambda: {
+    # Extensões permitidas (imutável: consultada a cada validação de upload)
+    allowed_extensions: FrozenSet[str] = field(default_factory=lambda: frozenset(
         ext.strip() for ext in os.getenv(
             "ALLOWED_EXTENSIONS", 
             ".png,.jpg,.jpeg,.gif,.bmp,.webp"
         ).split(",")
-    })
+    ))
 
 
 @dataclass
@@ -0,0 +1,9 @@
+"""
+Timezone da aplicação (horário de Brasília / Mato Grosso do Sul)
+"""
+import pytz
+
+TIMEZONE_NOME = "America/Campo_Grande"
+
+# Timezone resolvido uma única vez (pytz.timezone tem custo por chamada)
+TZ_BRASILIA = pytz.timezone(TIMEZONE_NOME)
@@ -2,10 +2,10 @@
 Serviço de Auditoria - Rastreamento de preenchimentos e aprovações - VERSÃO CORRIGIDA COM SESSÃO
 """
 from datetime import datetime
-import pytz
 from typing import Dict, Any, List, Tuple
 from ..core.session_state import get_session_state
 from ..config.logging_config import setup_logger
+from ..config.timezone_config import TZ_BRASILIA
 
 logger = setup_logger("audit_service")
 
@@ -16,7 +16,7 @@ class AuditService:
     @staticmethod
     def obter_timestamp_brasilia() -> str:
         """Retorna timestamp atual no formato SharePoint (Brasília)"""
-        agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+        agora = datetime.now(TZ_BRASILIA)
         return agora.strftime("%Y-%m-%dT%H:%M:%S")
     
     @staticmethod
@@ -132,18 +132,30 @@ class AuditService:
         from ..services.evento_processor import EventoProcessor
         status_evento = EventoProcessor.calcular_status_evento(df_evento, alteracoes_pendentes)
         
+        from ..services.data_formatter import DataFormatter
+        
+        # Colunas em posição fixa: itertuples devolve tuplas simples (sem criar uma Series por linha)
+        colunas_registro = df_evento.reindex(
+            columns=["ID", "Motivo", "Previsao_Liberacao", "Observacoes"], fill_value=""
+        )
+        
+        # Alterações deste evento indexadas pelo ID puro (uma varredura do dict global)
+        prefixo = f"{evento}_"
+        tamanho_prefixo = len(prefixo)
+        alteracoes_evento = {
+            chave[tamanho_prefixo:]: alteracao
+            for chave, alteracao in alteracoes_pendentes.items()
+            if chave.startswith(prefixo)
+        }
+        
         # Processa cada registro com alterações
-        for _, row in df_evento.iterrows():
-            row_id = str(row["ID"]).strip()
-            chave_alteracao = f"{evento}_{row_id}"
+        for item_id, valor_motivo_df, valor_previsao_df, valor_obs_df in colunas_registro.itertuples(
+            index=False, name=None
+        ):
+            row_id = str(item_id).strip()
+            alteracoes = alteracoes_evento.get(row_id)
             
-            if chave_alteracao in alteracoes_pendentes:
-                alteracoes = alteracoes_pendentes[chave_alteracao]
-                
-                # Valores atuais do DataFrame
-                valor_motivo_df = row.get("Motivo", "")
-                valor_previsao_df = row.get("Previsao_Liberacao", "")
-                valor_obs_df = row.get("Observacoes", "")
+            if alteracoes is not None:
                 
                 # Aplica alterações pendentes
                 valor_motivo_final = alteracoes.get("Motivo", valor_motivo_df)
@@ -151,7 +163,6 @@ class AuditService:
                 valor_obs_final = alteracoes.get("Observacoes", valor_obs_df)
                 
                 # Prepara dados base
-                from ..services.data_formatter import DataFormatter
                 dados_base = {
                     "Motivo": DataFormatter.formatar_valor_sharepoint(valor_motivo_final),
                     "Previsao_Liberacao": DataFormatter.formatar_valor_sharepoint(
@@ -197,8 +208,8 @@ class AuditService:
         dados_finais = AuditService.adicionar_auditoria_aprovacao(page, dados_base, status, justificativa)
         
         # Aplica para todos os registros do evento
-        for _, row in df_evento.iterrows():
-            atualizacoes_aprovacao.append((int(row["ID"]), dados_finais))
+        for item_id in df_evento["ID"]:
+            atualizacoes_aprovacao.append((int(item_id), dados_finais))
         
         logger.info(f"📊 Preparadas {len(atualizacoes_aprovacao)} {status.lower()}ções com auditoria")
         return atualizacoes_aprovacao
@@ -9,7 +9,17 @@ logger = setup_logger("auto_refresh")
 
 class AutoRefreshService:
     """Serviço de atualização automática - CORRIGIDO para não perder dados do usuário"""
-    
+
+    # Conjunto fixo de atributos: acesso por slot é mais rápido a cada tick do timer
+    __slots__ = (
+        "page", "app_controller",
+        "timer_ativo", "timer_pausado", "usuario_habilitou",
+        "thread_timer", "parar_thread",
+        "callback_atualizacao", "callback_status_mudou",
+        "segundos_restantes", "ultima_atualizacao",
+        "campos_monitorados", "usuario_digitando",
+    )
+
     def __init__(self, page, app_controller):
         self.page = page
         self.app_controller = app_controller
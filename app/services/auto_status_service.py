@@ -2,16 +2,119 @@
 Serviço de Processamento Automático de Status - Não Tratado
 MODIFICADO: Usa data/hora do desvio extraída do título ao invés da data de criação
 """
+import logging
+import re
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-import pytz
-from typing import List, Tuple, Dict, Any
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Optional
 from ..config.logging_config import setup_logger
 from ..services.sharepoint_client import SharePointClient
 from ..config.settings import business_rules
+from ..config.timezone_config import TZ_BRASILIA
+
+try:
+    from .location_processor import location_processor
+    LOCATION_PROCESSOR_AVAILABLE = True
+except ImportError:
+    LOCATION_PROCESSOR_AVAILABLE = False
+    location_processor = None
+
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+    ciso8601 = None
 
 logger = setup_logger("auto_status_service")
 
+# Sufixo de data/hora do título: ..._DDMMAAAA_HHMMSS
+_TITULO_RE = re.compile(r"_(\d{2})(\d{2})(\d{4})_(\d{2})(\d{2})(\d{2})$")
+_TITULO_RE_COLUNAS = ["day", "month", "year", "hour", "minute", "second"]
+
+# Sufixo de timezone de datas ISO: "Z" ou offset "+HH:MM" / "-HHMM"
+_OFFSET_ISO_RE = re.compile(r"(?:[Zz]|[+-]\d{2}:?\d{2})$")
+
+
+@lru_cache(maxsize=4096)
+def _parse_titulo_para_datetime(titulo: str) -> Optional[datetime]:
+    """
+    Data/hora do desvio extraída do título via location_processor (memoizado por título)
+    
+    Returns:
+        datetime com timezone de Brasília ou None se o título não tiver data válida
+    """
+    data_evento = location_processor.parse_titulo_com_localizacao(titulo).get("data_evento")
+    if not data_evento:
+        return None
+    
+    if data_evento.tzinfo is None:
+        return TZ_BRASILIA.localize(data_evento)
+    return data_evento.astimezone(TZ_BRASILIA)
+
+
+def _parse_criacao_iso(texto: str) -> Optional[datetime]:
+    """
+    Data de criação em formato ISO (SharePoint) no horário de Brasília
+    
+    Valores sem timezone já estão no horário local; com timezone são convertidos.
+    
+    Returns:
+        datetime com timezone de Brasília ou None se inválida
+    """
+    dt_criacao = None
+    if CISO8601_AVAILABLE:
+        try:
+            dt_criacao = ciso8601.parse_datetime(texto)
+        except ValueError:
+            dt_criacao = None
+    
+    if dt_criacao is None:
+        # Fallback: pandas aceita formatos não estritamente ISO
+        dt_criacao = pd.to_datetime(texto, errors="coerce")
+        if pd.isnull(dt_criacao):
+            return None
+    
+    if dt_criacao.tzinfo is None:
+        return TZ_BRASILIA.localize(dt_criacao)
+    return dt_criacao.astimezone(TZ_BRASILIA)
+
+
+def _criacao_iso_sem_timezone(texto: str) -> Optional[datetime]:
+    """Data de criação ISO no horário de Brasília, sem timezone (None se inválida)"""
+    dt_criacao = _parse_criacao_iso(texto)
+    return dt_criacao.replace(tzinfo=None) if dt_criacao is not None else None
+
+
+def _data_titulo_sem_timezone(titulo: str) -> Optional[datetime]:
+    """Data do título no horário de Brasília, sem timezone (None se inválida)"""
+    data_evento = _parse_titulo_para_datetime(titulo)
+    return data_evento.replace(tzinfo=None) if data_evento else None
+
+
+@lru_cache(maxsize=4096)
+def _parse_manual_titulo_para_datetime(titulo: str) -> datetime:
+    """
+    Parse manual do título no formato LOCALIZACAO_POI_TIPO_DDMMAAAA_HHMMSS (memoizado por título)
+    
+    Raises:
+        ValueError: Se o título não estiver no formato esperado ou a data for inválida
+    """
+    m = _TITULO_RE.search(titulo)
+    if not m or titulo.count('_') < 4:
+        raise ValueError("Formato de título inválido")
+    
+    dia, mes, ano, hora, minuto, segundo = m.groups()
+    
+    # Cria datetime do evento
+    data_evento = datetime(
+        int(ano), int(mes), int(dia),
+        int(hora), int(minuto), int(segundo)
+    )
+    return TZ_BRASILIA.localize(data_evento)
+
 
 class AutoStatusService:
     """Serviço para processamento automático de status 'Não Tratado'"""
@@ -19,102 +122,78 @@ class AutoStatusService:
     @staticmethod
     def obter_timezone_brasilia():
         """Retorna timezone de Brasília"""
-        return pytz.timezone("America/Campo_Grande")
+        return TZ_BRASILIA
     
     @staticmethod
-    def calcular_tempo_decorrido_por_titulo(titulo: str, data_criacao_fallback: str = None) -> float:
+    def calcular_tempo_decorrido_por_titulo(titulo: str, data_criacao_fallback: str = None,
+                                            agora: Optional[datetime] = None) -> float:
         """
         NOVO: Calcula tempo decorrido desde o EVENTO (extraído do título)
         
         Args:
             titulo: Título do evento (ex: TLS_PACelulose_N1_31072025_020000)
             data_criacao_fallback: Data de criação para fallback se parse falhar
+            agora: Instante de referência (com timezone); calculado se None.
+                Em lotes, passe o mesmo valor para todas as linhas
             
         Returns:
             float: Horas decorridas desde o evento real
         """
+        if agora is None:
+            agora = datetime.now(TZ_BRASILIA)
+        
         if not titulo or str(titulo).strip() == "":
-            return AutoStatusService.calcular_tempo_decorrido_evento(data_criacao_fallback) if data_criacao_fallback else 0
+            return AutoStatusService.calcular_tempo_decorrido_evento(data_criacao_fallback, agora) if data_criacao_fallback else 0
         
         try:
-            # Importa location_processor para reutilizar lógica existente
-            try:
-                from .location_processor import location_processor
-                evento_info = location_processor.parse_titulo_com_localizacao(titulo)
-                data_evento = evento_info.get("data_evento")
+            # Reutiliza lógica existente do location_processor
+            if LOCATION_PROCESSOR_AVAILABLE:
+                data_evento = _parse_titulo_para_datetime(titulo)
                 
                 if data_evento:
                     # Calcula diferença com agora
-                    tz_brasilia = AutoStatusService.obter_timezone_brasilia()
-                    agora = datetime.now(tz_brasilia)
-                    
-                    # Garante que data_evento tem timezone
-                    if data_evento.tzinfo is None:
-                        data_evento = tz_brasilia.localize(data_evento)
-                    else:
-                        data_evento = data_evento.astimezone(tz_brasilia)
-                    
                     diferenca = agora - data_evento
                     horas = diferenca.total_seconds() / 3600
                     
                     logger.debug(f"🕒 Evento {titulo}: {horas:.1f}h desde o desvio real")
                     return max(0, horas)
-                    
-            except ImportError:
+            else:
                 logger.warning("⚠️ location_processor não disponível, usando parse manual")
             
             # FALLBACK: Parse manual do título se location_processor não disponível
-            return AutoStatusService._parse_manual_titulo(titulo, data_criacao_fallback)
+            return AutoStatusService._parse_manual_titulo(titulo, data_criacao_fallback, agora)
             
         except Exception as e:
             logger.warning(f"⚠️ Erro ao extrair data do título '{titulo}': {e}")
             
             # Fallback para data de criação
             if data_criacao_fallback:
-                return AutoStatusService.calcular_tempo_decorrido_evento(data_criacao_fallback)
+                return AutoStatusService.calcular_tempo_decorrido_evento(data_criacao_fallback, agora)
             
             return 0
     
     @staticmethod
-    def _parse_manual_titulo(titulo: str, data_criacao_fallback: str = None) -> float:
+    def _parse_manual_titulo(titulo: str, data_criacao_fallback: str = None,
+                             agora: Optional[datetime] = None) -> float:
         """
         Parse manual do título no formato: LOCALIZACAO_POI_TIPO_DDMMAAAA_HHMMSS
         
         Args:
             titulo: Título do evento
             data_criacao_fallback: Fallback se parse falhar
+            agora: Instante de referência (com timezone); calculado se None
             
         Returns:
             float: Horas decorridas
         """
+        if agora is None:
+            agora = datetime.now(TZ_BRASILIA)
+        
         try:
-            partes = titulo.split('_')
-            if len(partes) < 5:
-                raise ValueError("Formato de título inválido")
+            data_evento = _parse_manual_titulo_para_datetime(titulo)
             
-            data_str = partes[-2]  # DDMMAAAA
-            hora_str = partes[-1]  # HHMMSS
-            
-            # Parse da data: DDMMAAAA -> DD/MM/AAAA
-            if len(data_str) == 8 and len(hora_str) == 6:
-                dia = data_str[:2]
-                mes = data_str[2:4]
-                ano = data_str[4:8]
-                
-                hora = hora_str[:2]
-                minuto = hora_str[2:4]
-                segundo = hora_str[4:6]
-                
-                # Cria datetime do evento
-                tz_brasilia = AutoStatusService.obter_timezone_brasilia()
-                data_evento = datetime(
-                    int(ano), int(mes), int(dia),
-                    int(hora), int(minuto), int(segundo)
-                )
-                data_evento = tz_brasilia.localize(data_evento)
-                
+            if data_evento:
                 # Calcula diferença
-                agora = datetime.now(tz_brasilia)
                 diferenca = agora - data_evento
                 horas = diferenca.total_seconds() / 3600
                 
@@ -126,17 +205,18 @@ class AutoStatusService:
         
         # Fallback final para data de criação
         if data_criacao_fallback:
-            return AutoStatusService.calcular_tempo_decorrido_evento(data_criacao_fallback)
+            return AutoStatusService.calcular_tempo_decorrido_evento(data_criacao_fallback, agora)
         
         return 0
     
     @staticmethod
-    def calcular_tempo_decorrido_evento(data_criacao: str) -> float:
+    def calcular_tempo_decorrido_evento(data_criacao: str, agora: Optional[datetime] = None) -> float:
         """
         MANTIDO: Calcula tempo decorrido desde a CRIAÇÃO do registro (fallback)
         
         Args:
             data_criacao: Data/hora de criação do registro no SharePoint
+            agora: Instante de referência (com timezone); calculado se None
             
         Returns:
             float: Horas decorridas desde a criação ou 0 se inválido
@@ -146,8 +226,9 @@ class AutoStatusService:
         
         try:
             # Timezone de Brasília
-            tz_brasilia = AutoStatusService.obter_timezone_brasilia()
-            agora = datetime.now(tz_brasilia)
+            tz_brasilia = TZ_BRASILIA
+            if agora is None:
+                agora = datetime.now(tz_brasilia)
             
             # Parse da data de criação
             if "/" in str(data_criacao):
@@ -156,14 +237,9 @@ class AutoStatusService:
                 dt_criacao = tz_brasilia.localize(dt_criacao)
             else:
                 # Formato ISO do SharePoint: "2025-07-24T15:30:00Z"
-                dt_criacao = pd.to_datetime(data_criacao, errors="coerce")
-                if pd.isnull(dt_criacao):
+                dt_criacao = _parse_criacao_iso(str(data_criacao).strip())
+                if dt_criacao is None:
                     return 0
-                
-                if dt_criacao.tzinfo is None:
-                    dt_criacao = tz_brasilia.localize(dt_criacao)
-                else:
-                    dt_criacao = dt_criacao.tz_convert(tz_brasilia)
             
             # Calcula diferença em horas
             diferenca = agora - dt_criacao
@@ -175,6 +251,93 @@ class AutoStatusService:
             logger.warning(f"⚠️ Erro ao calcular tempo desde criação: {e}")
             return 0
     
+    @staticmethod
+    def _extrair_datas_dos_titulos(titulos: pd.Series) -> pd.Series:
+        """
+        Versão vetorizada do parse de data/hora do título (..._DDMMAAAA_HHMMSS)
+        
+        Args:
+            titulos: Series com títulos dos eventos
+            
+        Returns:
+            Series de datas sem timezone, no horário de Brasília (NaT quando o título é inválido)
+        """
+        titulos = titulos.fillna("").astype(str)
+        
+        # Mesmo critério do parse escalar: pelo menos 5 partes separadas por "_"
+        formato_valido = titulos.str.count("_") >= 4
+        
+        partes = titulos.where(formato_valido, "").str.extract(_TITULO_RE)
+        partes.columns = _TITULO_RE_COLUNAS
+        partes = partes.astype(float)
+        # Resolução fixa em ns: o fallback pela data de criação pode ter frações de segundo
+        datas = pd.to_datetime(partes, errors="coerce").astype("datetime64[ns]")
+        # to_datetime "rola" hora/minuto/segundo fora da faixa (24h → dia seguinte):
+        # esses casos vão para o parse escalar abaixo
+        datas[(partes["hour"] > 23) | (partes["minute"] > 59) | (partes["second"] > 59)] = pd.NaT
+        
+        # Larguras fora do padrão (ex: "..._2172025_160000") não casam com a regex:
+        # usam o parse escalar memoizado, o mesmo de calcular_tempo_decorrido_por_titulo
+        fora_do_padrao = formato_valido & datas.isna()
+        if LOCATION_PROCESSOR_AVAILABLE and fora_do_padrao.any():
+            datas[fora_do_padrao] = pd.to_datetime(
+                titulos[fora_do_padrao].map(_data_titulo_sem_timezone), errors="coerce"
+            )
+        
+        return datas
+    
+    @staticmethod
+    def _converter_datas_criacao(datas_criacao: pd.Series, tz_brasilia) -> pd.Series:
+        """
+        Versão vetorizada da conversão da data de criação (fallback)
+        
+        Args:
+            datas_criacao: Series com datas de criação (brasileiro ou ISO do SharePoint)
+            tz_brasilia: Timezone de Brasília
+            
+        Returns:
+            Series de datas sem timezone, no horário de Brasília (NaT quando inválida)
+        """
+        if pd.api.types.is_datetime64_any_dtype(datas_criacao):
+            if datas_criacao.dt.tz is None:
+                return datas_criacao
+            return datas_criacao.dt.tz_convert(tz_brasilia).dt.tz_localize(None)
+        
+        textos = datas_criacao.fillna("").astype(str).str.strip()
+        formato_br = textos.str.contains("/", regex=False)
+        
+        resultado = pd.Series(pd.NaT, index=textos.index, dtype="datetime64[ns]")
+        if formato_br.any():
+            # Formato brasileiro: "24/07/2025 15:30"
+            resultado[formato_br] = pd.to_datetime(
+                textos[formato_br], format="%d/%m/%Y %H:%M", errors="coerce", cache=True
+            )
+        if (~formato_br).any():
+            # Formato ISO do SharePoint: "2025-07-24T15:30:00Z" (com offset) ou sem
+            # timezone (já no horário local, como no parse escalar)
+            textos_iso = textos[~formato_br]
+            com_offset = textos_iso.str.contains(_OFFSET_ISO_RE)
+            datas_iso = pd.Series(pd.NaT, index=textos_iso.index, dtype="datetime64[ns]")
+            if com_offset.any():
+                datas_iso[com_offset] = pd.to_datetime(
+                    textos_iso[com_offset], format="ISO8601", errors="coerce", utc=True, cache=True
+                ).dt.tz_convert(tz_brasilia).dt.tz_localize(None)
+            if (~com_offset).any():
+                datas_iso[~com_offset] = pd.to_datetime(
+                    textos_iso[~com_offset], format="ISO8601", errors="coerce", cache=True
+                )
+            
+            # Formatos não ISO: mesmas regras do parse escalar, valor a valor
+            restantes = datas_iso.isna() & (textos_iso != "")
+            if restantes.any():
+                datas_iso[restantes] = pd.to_datetime(
+                    textos_iso[restantes].map(_criacao_iso_sem_timezone), errors="coerce"
+                )
+            
+            resultado[~formato_br] = datas_iso
+        
+        return resultado
+    
     @staticmethod
     def identificar_eventos_para_nao_tratado(df_desvios: pd.DataFrame) -> pd.DataFrame:
         """
@@ -196,40 +359,55 @@ class AutoStatusService:
                 logger.warning(f"⚠️ Coluna '{col}' não encontrada no DataFrame.")
                 return pd.DataFrame()
         
-        # Filtra apenas eventos que não estão finalizados
+        # Filtra apenas eventos que não estão finalizados (sem cópia: só leitura)
         eventos_ativos = df_desvios[
             ~df_desvios["Status"].isin(["Aprovado", "Não Tratado"])
-        ].copy()
+        ]
         
         if eventos_ativos.empty:
             return pd.DataFrame()
         
-        # NOVA LÓGICA: Calcula tempo baseado no título (data do desvio)
-        def calcular_tempo_por_linha(row):
-            titulo = row.get("Titulo", "")
-            data_criacao = row.get("Criado", "")
-            return AutoStatusService.calcular_tempo_decorrido_por_titulo(titulo, data_criacao)
+        # NOVA LÓGICA: Calcula tempo baseado no título (data do desvio) - vetorizado
+        # Datas ficam sem timezone (horário local de Brasília): a subtração é feita
+        # direto em datetime64 do NumPy, sem tz_localize por elemento
+        agora = datetime.now(TZ_BRASILIA)
+        agora64 = np.datetime64(agora.replace(tzinfo=None), "s")
         
-        eventos_ativos["tempo_decorrido_horas"] = eventos_ativos.apply(calcular_tempo_por_linha, axis=1)
+        data_evento = AutoStatusService._extrair_datas_dos_titulos(eventos_ativos["Titulo"])
         
-        # Filtra eventos com mais de 2 horas desde o DESVIO
-        eventos_expirados = eventos_ativos[
-            eventos_ativos["tempo_decorrido_horas"] > business_rules.auto_status_limit_hours
-        ]
+        # Fallback para data de criação quando o título não tem data válida
+        sem_data = data_evento.isna()
+        if sem_data.any():
+            data_evento[sem_data] = AutoStatusService._converter_datas_criacao(
+                eventos_ativos.loc[sem_data, "Criado"], TZ_BRASILIA
+            )
+        
+        horas = (agora64 - data_evento.to_numpy(dtype="datetime64[s]")) / np.timedelta64(1, "h")
+        # Limite inferior aplicado uma vez no vetor (equivale ao max(0, horas) da versão escalar);
+        # NaT (sem data válida) vira 0
+        horas = np.nan_to_num(np.clip(horas, 0, None))
+        
+        # Filtra eventos com mais de 2 horas desde o DESVIO; só os expirados são copiados
+        expirado = horas > business_rules.auto_status_limit_hours
+        eventos_expirados = eventos_ativos[expirado].copy()
+        eventos_expirados["tempo_decorrido_horas"] = horas[expirado]
         
         if not eventos_expirados.empty:
             logger.info(f"🔍 Encontrados {len(eventos_expirados)} registros para marcar como 'Não Tratado' (baseado na data do DESVIO)")
             
             # Log adicional para debug (mostra diferença entre data do desvio e criação)
-            for _, row in eventos_expirados.head(3).iterrows():
-                titulo = row.get("Titulo", "N/A")
-                criado = row.get("Criado", "N/A")
-                tempo_desvio = row.get("tempo_decorrido_horas", 0)
-                tempo_criacao = AutoStatusService.calcular_tempo_decorrido_evento(criado)
-                
-                logger.debug(f"📋 Evento: {titulo}")
-                logger.debug(f"   ⏰ Tempo desde desvio: {tempo_desvio:.1f}h")
-                logger.debug(f"   📅 Tempo desde criação: {tempo_criacao:.1f}h")
+            # Só calcula quando DEBUG está ativo: os argumentos seriam avaliados mesmo sem emitir
+            if logger.isEnabledFor(logging.DEBUG):
+                amostra = eventos_expirados.head(3)[["Titulo", "Criado", "tempo_decorrido_horas"]]
+                for registro in amostra.to_dict("records"):
+                    titulo = registro["Titulo"]
+                    criado = registro["Criado"]
+                    tempo_desvio = registro["tempo_decorrido_horas"]
+                    tempo_criacao = AutoStatusService.calcular_tempo_decorrido_evento(criado, agora)
+                    
+                    logger.debug(f"📋 Evento: {titulo}")
+                    logger.debug(f"   ⏰ Tempo desde desvio: {tempo_desvio:.1f}h")
+                    logger.debug(f"   📅 Tempo desde criação: {tempo_criacao:.1f}h")
         
         return eventos_expirados
     
@@ -249,8 +427,7 @@ class AutoStatusService:
         
         try:
             # Prepara dados para auditoria automática
-            tz_brasilia = AutoStatusService.obter_timezone_brasilia()
-            timestamp_atual = datetime.now(tz_brasilia).strftime("%Y-%m-%dT%H:%M:%S")
+            timestamp_atual = datetime.now(TZ_BRASILIA).strftime("%Y-%m-%dT%H:%M:%S")
             
             # Dados para atualização
             dados_atualizacao = {
@@ -259,11 +436,9 @@ class AutoStatusService:
                 "Data_Aprovacao": timestamp_atual
             }
             
-            # Prepara lista de atualizações
-            atualizacoes_lote = []
-            for _, row in df_eventos_expirados.iterrows():
-                item_id = int(row["ID"])
-                atualizacoes_lote.append((item_id, dados_atualizacao.copy()))
+            # Prepara lista de atualizações (payload idêntico, compartilhado entre os itens)
+            ids = df_eventos_expirados["ID"].to_numpy(dtype=np.int64)
+            atualizacoes_lote = [(int(item_id), dados_atualizacao) for item_id in ids]
             
             # Executa atualizações em lote
             if atualizacoes_lote:
@@ -307,11 +482,13 @@ class AutoStatusService:
             # 3. Atualiza status no DataFrame local (para não esperar próximo carregamento)
             if atualizacoes_realizadas > 0:
                 # Marca eventos processados como "Não Tratado" no DataFrame atual
-                ids_processados = eventos_expirados["ID"].tolist()
-                df_desvios.loc[df_desvios["ID"].isin(ids_processados), "Status"] = "Não Tratado"
+                # (eventos_expirados é subconjunto de df_desvios: usa o índice direto)
+                df_desvios.loc[eventos_expirados.index, "Status"] = "Não Tratado"
         
         # 4. Filtra eventos "Não Tratado" do resultado
-        df_filtrado = df_desvios[df_desvios["Status"] != "Não Tratado"].copy()
+        # .copy() mantido: o DataFrame filtrado é alterado depois pela interface
+        manter = df_desvios["Status"].to_numpy() != "Não Tratado"
+        df_filtrado = df_desvios[manter].copy()
         
         registros_filtrados = len(df_desvios) - len(df_filtrado)
         if registros_filtrados > 0:
@@ -345,6 +522,7 @@ def calcular_tempo_decorrido(data_criacao: str) -> float:
     return auto_status_service.calcular_tempo_decorrido_evento(data_criacao)
 
 
-def calcular_tempo_decorrido_por_titulo(titulo: str, data_criacao_fallback: str = None) -> float:
+def calcular_tempo_decorrido_por_titulo(titulo: str, data_criacao_fallback: str = None,
+                                        agora: Optional[datetime] = None) -> float:
     """NOVO: Calcula tempo decorrido desde o evento extraído do título"""
-    return auto_status_service.calcular_tempo_decorrido_por_titulo(titulo, data_criacao_fallback)
\ No newline at end of file
+    return auto_status_service.calcular_tempo_decorrido_por_titulo(titulo, data_criacao_fallback, agora)
\ No newline at end of file
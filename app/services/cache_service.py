@@ -4,6 +4,7 @@ Implementa cache em memória com TTL para dados do SharePoint
 """
 import time
 import threading
+from collections import OrderedDict
 from typing import Any, Dict, Optional, Callable, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
@@ -14,52 +15,66 @@ logger = logging.getLogger(__name__)
 
 
 class CacheEntry:
-    """Entrada individual do cache com TTL"""
+    """Entrada individual do cache com TTL (timestamps em time.monotonic())"""
     
     def __init__(self, data: Any, ttl_seconds: int = 300):
         self.data = data
-        self.created_at = time.time()
+        self.created_at = time.monotonic()
         self.ttl_seconds = ttl_seconds
         self.access_count = 0
-        self.last_access = time.time()
+        self.last_access = self.created_at
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Verifica se entrada expirou"""
-        return time.time() - self.created_at > self.ttl_seconds
+        if now is None:
+            now = time.monotonic()
+        return now - self.created_at > self.ttl_seconds
     
-    def is_valid(self) -> bool:
+    def is_valid(self, now: Optional[float] = None) -> bool:
         """Verifica se entrada é válida (não expirada)"""
-        return not self.is_expired()
+        return not self.is_expired(now)
     
-    def touch(self):
+    def touch(self, now: Optional[float] = None):
         """Atualiza último acesso"""
         self.access_count += 1
-        self.last_access = time.time()
+        self.last_access = time.monotonic() if now is None else now
     
-    def get_data(self) -> Any:
-        """Retorna dados e atualiza estatísticas de acesso"""
-        if self.is_expired():
+    def get_data(self, now: Optional[float] = None) -> Any:
+        """Retorna dados e atualiza estatísticas de acesso (uma única leitura de relógio)"""
+        if now is None:
+            now = time.monotonic()
+        
+        if self.is_expired(now):
             return None
         
-        self.touch()
+        self.touch(now)
         return self.data
 
 
 class SharePointCache:
-    """Cache inteligente para dados do SharePoint"""
+    """
+    Cache inteligente para dados do SharePoint
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 300):
+    ⚠️ Por padrão os DataFrames NÃO são copiados em get/set: o cache guarda e
+    devolve o mesmo objeto. Quem for alterar o DataFrame deve chamar .copy()
+    antes (ou usar copy_on_read=True).
+    """
+    
+    def __init__(self, max_size: int = 1000, default_ttl: int = 300, copy_on_read: bool = False):
         """
         Inicializa cache
         
         Args:
             max_size: Número máximo de entradas no cache
             default_ttl: TTL padrão em segundos (5 minutos)
+            copy_on_read: True = get() devolve cópia dos DataFrames (isolamento total)
         """
-        self._cache: Dict[str, CacheEntry] = {}
+        # Ordem de inserção = ordem de uso (LRU): mais antigo no início
+        self._cache: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
         self._lock = threading.RLock()
         self._max_size = max_size
         self._default_ttl = default_ttl
+        self._copy_on_read = copy_on_read
         
         # Estatísticas
         self._hits = 0
@@ -68,17 +83,11 @@ class SharePointCache:
         
         logger.info(f"📦 SharePointCache inicializado - Max: {max_size}, TTL: {default_ttl}s")
     
-    def _generate_key(self, list_name: str, **kwargs) -> str:
-        """Gera chave única para cache baseada nos parâmetros"""
-        # Cria chave baseada em parâmetros relevantes
-        key_parts = [f"list:{list_name}"]
-        
-        # Adiciona parâmetros ordenados para consistência
-        for k, v in sorted(kwargs.items()):
-            if v is not None:
-                key_parts.append(f"{k}:{v}")
-        
-        return "|".join(key_parts)
+    @staticmethod
+    def _generate_key(list_name: str, **kwargs) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+        """Gera chave única para cache baseada nos parâmetros (tupla hashável, sem montar strings)"""
+        # Parâmetros ordenados para consistência; None é ignorado
+        return (list_name, tuple(sorted((k, v) for k, v in kwargs.items() if v is not None)))
     
     def get(self, list_name: str, **kwargs) -> Optional[pd.DataFrame]:
         """
@@ -89,7 +98,8 @@ class SharePointCache:
             **kwargs: Parâmetros adicionais da consulta
             
         Returns:
-            DataFrame se encontrado e válido, None caso contrário
+            DataFrame se encontrado e válido, None caso contrário.
+            Sem copy_on_read, é o mesmo objeto guardado no cache (não alterar).
         """
         key = self._generate_key(list_name, **kwargs)
         
@@ -101,7 +111,7 @@ class SharePointCache:
                 logger.debug(f"❌ Cache MISS: {key}")
                 return None
             
-            data = entry.get_data()
+            data = entry.get_data(time.monotonic())
             
             if data is None:
                 # Entrada expirada
@@ -110,11 +120,15 @@ class SharePointCache:
                 logger.debug(f"⏰ Cache EXPIRED: {key}")
                 return None
             
+            self._cache.move_to_end(key)
             self._hits += 1
             logger.debug(f"✅ Cache HIT: {key} (acessos: {entry.access_count})")
             
-            # Retorna cópia para evitar modificações
-            return data.copy() if isinstance(data, pd.DataFrame) else data
+            if self._copy_on_read and isinstance(data, pd.DataFrame):
+                return data.copy()
+            
+            # Objeto compartilhado com o cache: trate como somente leitura
+            return data
     
     def set(self, list_name: str, data: pd.DataFrame, ttl_seconds: Optional[int] = None, **kwargs):
         """
@@ -122,7 +136,7 @@ class SharePointCache:
         
         Args:
             list_name: Nome da lista SharePoint
-            data: Dados a serem armazenados
+            data: Dados a serem armazenados (sem cópia; não alterar após o set)
             ttl_seconds: TTL customizado (usa default se None)
             **kwargs: Parâmetros adicionais da consulta
         """
@@ -135,12 +149,12 @@ class SharePointCache:
         
         with self._lock:
             # Verifica limite de tamanho
-            if len(self._cache) >= self._max_size:
+            if key not in self._cache and len(self._cache) >= self._max_size:
                 self._evict_oldest()
             
-            # Armazena cópia para evitar modificações externas
-            data_copy = data.copy() if isinstance(data, pd.DataFrame) else data
-            self._cache[key] = CacheEntry(data_copy, ttl)
+            # Armazena o próprio objeto: quem chamou não deve alterá-lo depois
+            self._cache[key] = CacheEntry(data, ttl)
+            self._cache.move_to_end(key)
             
             logger.debug(f"💾 Cache SET: {key} (TTL: {ttl}s, tamanho: {len(data) if hasattr(data, '__len__') else 'N/A'})")
     
@@ -155,10 +169,8 @@ class SharePointCache:
     
     def invalidate_list(self, list_name: str):
         """Invalida todas as entradas de uma lista específica"""
-        prefix = f"list:{list_name}"
-        
         with self._lock:
-            keys_to_remove = [k for k in self._cache.keys() if k.startswith(prefix)]
+            keys_to_remove = [k for k in self._cache.keys() if k[0] == list_name]
             
             for key in keys_to_remove:
                 del self._cache[key]
@@ -176,7 +188,8 @@ class SharePointCache:
     def cleanup_expired(self):
         """Remove entradas expiradas"""
         with self._lock:
-            expired_keys = [k for k, v in self._cache.items() if v.is_expired()]
+            now = time.monotonic()
+            expired_keys = [k for k, v in self._cache.items() if v.is_expired(now)]
             
             for key in expired_keys:
                 del self._cache[key]
@@ -189,17 +202,15 @@ class SharePointCache:
         if not self._cache:
             return
         
-        # Remove entrada com acesso mais antigo
-        oldest_key = min(self._cache.keys(), 
-                        key=lambda k: self._cache[k].last_access)
-        
-        del self._cache[oldest_key]
+        # Remove entrada com acesso mais antigo (início do OrderedDict) - O(1)
+        oldest_key, _ = self._cache.popitem(last=False)
         self._evictions += 1
         logger.debug(f"🚮 Cache EVICTED: {oldest_key}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do cache"""
         with self._lock:
+            now = time.monotonic()
             total_requests = self._hits + self._misses
             hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
             
@@ -210,7 +221,7 @@ class SharePointCache:
                 'misses': self._misses,
                 'hit_rate_percent': round(hit_rate, 2),
                 'evictions': self._evictions,
-                'expired_entries': sum(1 for v in self._cache.values() if v.is_expired())
+                'expired_entries': sum(1 for v in self._cache.values() if v.is_expired(now))
             }
     
     def get_info(self) -> str:
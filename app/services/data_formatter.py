@@ -2,9 +2,9 @@
 Formatador de dados - conversões e formatações
 """
 import pandas as pd
-import pytz
 from datetime import datetime
 from typing import Any
+from ..config.timezone_config import TZ_BRASILIA
 
 
 class DataFormatter:
@@ -16,25 +16,33 @@ class DataFormatter:
         if valor == "— Selecione —":
             return ""
         
+        if valor is None:
+            return None if campo == "Previsao_Liberacao" else ""
+        
+        # Conversão para string feita uma única vez
+        texto = valor if isinstance(valor, str) else str(valor)
+        texto_limpo = texto.strip()
+        texto_lower = texto.lower()
+        
         if campo == "Previsao_Liberacao":
-            if valor is None or str(valor).strip() == "" or str(valor).lower() in ("none", "nat"):
+            if texto_limpo == "" or texto_lower in ("none", "nat"):
                 return None
             
-            if isinstance(valor, pd.Timestamp) or isinstance(valor, datetime):
+            if isinstance(valor, (pd.Timestamp, datetime)):
                 return valor.strftime("%Y-%m-%dT%H:%M:%S")
             
-            try:
-                if "/" in str(valor):
-                    dt = datetime.strptime(str(valor).strip(), "%d/%m/%Y %H:%M")
+            if "/" in texto:
+                try:
+                    dt = datetime.strptime(texto_limpo, "%d/%m/%Y %H:%M")
                     return dt.strftime("%Y-%m-%dT%H:%M:%S")
-            except:
-                pass
+                except (ValueError, TypeError):
+                    pass
             
-            return str(valor).strip() if valor else None
+            return texto_limpo if valor else None
         else:
-            if valor is None or str(valor).lower() in ("none", "nat"):
+            if texto_lower in ("none", "nat"):
                 return ""
-            return str(valor).strip()
+            return texto_limpo
     
     @staticmethod
     def formatar_data_exibicao(valor: Any) -> str:
@@ -46,7 +54,7 @@ class DataFormatter:
             if isinstance(valor, str):
                 try:
                     dt = datetime.strptime(valor, "%d/%m/%Y %H:%M")
-                    dt = pytz.timezone("America/Campo_Grande").localize(dt)
+                    dt = TZ_BRASILIA.localize(dt)
                 except ValueError:
                     dt = pd.to_datetime(valor, errors="coerce", utc=True)
             else:
@@ -56,14 +64,57 @@ class DataFormatter:
                 return str(valor)
             
             if dt.tzinfo is None:
-                dt = pytz.timezone("America/Campo_Grande").localize(dt)
+                dt = TZ_BRASILIA.localize(dt)
             else:
-                dt = dt.tz_convert("America/Campo_Grande")
+                dt = dt.tz_convert(TZ_BRASILIA)
             
             return dt.strftime("%d/%m/%Y %H:%M")
         except:
             return str(valor)
     
+    @staticmethod
+    def formatar_datas_exibicao(serie: pd.Series) -> pd.Series:
+        """
+        Versão vetorizada de formatar_data_exibicao para colunas inteiras
+        
+        Args:
+            serie: Series com datas (datetime, Timestamp ou strings)
+            
+        Returns:
+            Series de strings "DD/MM/AAAA HH:MM" (mesmas regras da versão escalar)
+        """
+        if serie.empty:
+            return serie.astype(object)
+        
+        try:
+            if pd.api.types.is_datetime64_any_dtype(serie):
+                dts = serie if serie.dt.tz is not None else serie.dt.tz_localize("UTC")
+                return dts.dt.tz_convert(TZ_BRASILIA).dt.strftime("%d/%m/%Y %H:%M").fillna("")
+            
+            textos = serie.astype(str).str.strip()
+            vazios = serie.isna() | textos.str.lower().isin(["none", ""])
+            
+            # Formato brasileiro (horário local) primeiro, como na versão escalar
+            eh_texto = serie.map(lambda v: isinstance(v, str))
+            dts = pd.to_datetime(
+                serie.where(eh_texto), format="%d/%m/%Y %H:%M", errors="coerce"
+            ).dt.tz_localize(TZ_BRASILIA, ambiguous="NaT", nonexistent="NaT")
+            
+            # Demais valores: parse genérico em UTC
+            restantes = dts.isna() & ~vazios
+            if restantes.any():
+                dts[restantes] = pd.to_datetime(
+                    serie[restantes], errors="coerce", utc=True, format="mixed"
+                ).dt.tz_convert(TZ_BRASILIA)
+            
+            formatadas = dts.dt.strftime("%d/%m/%Y %H:%M")
+            
+            # Valores não reconhecidos são exibidos como texto original
+            formatadas = formatadas.where(dts.notna(), serie.astype(str))
+            return formatadas.where(~vazios, "")
+        except (ValueError, TypeError):
+            return serie.apply(DataFormatter.formatar_data_exibicao)
+    
     @staticmethod
     def formatar_tempo_decorrido(horas: float) -> str:
         """Formata tempo decorrido para exibição"""
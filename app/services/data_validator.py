@@ -2,14 +2,36 @@
 Validador de dados - VERSÃO MIGRADA PARA SISTEMA CENTRALIZADO
 Mantém API pública mas usa validadores centralizados internamente
 """
+import re
 import pandas as pd
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # 🚀 NOVA IMPORTAÇÃO - Usa sistema centralizado
-from ..validators import field_validator, business_validator
+from ..validators import field_validator, business_validator, security_validator
+from ..validators.base import ValidationMessages
 from ..validators.migration_wrapper import migration_wrapper
 
+# Tabela de despacho de validar_multiplos_campos: tipo -> (valor, nome_campo, params)
+_VALIDADORES_POR_TIPO = {
+    "email": lambda valor, nome_campo, params: field_validator.validate_email_field(valor, **params),
+    "texto": lambda valor, nome_campo, params: field_validator.validate_text_field(valor, nome_campo, **params),
+    "numero": lambda valor, nome_campo, params: field_validator.validate_number_field(valor, nome_campo, **params),
+    "data_hora": lambda valor, nome_campo, params: field_validator.validate_datetime_fields(
+        params.get("data", ""), params.get("hora", ""),
+        **{k: v for k, v in params.items() if k not in ("data", "hora")}
+    ),
+}
+
+# Mesmo padrão compilado do FieldValidator, usado para rejeitar emails inválidos sem o wrapper
+_EMAIL_RE = field_validator.patterns['email']
+_ERRO_EMAIL_INVALIDO = ValidationMessages.format_message(
+    ValidationMessages.FIELD_INVALID_FORMAT, field="Email"
+)
+
+# Detecção do tipo de campo pelo nome em uma única varredura
+_TIPO_CAMPO_RE = re.compile(r"email|data|senha", re.IGNORECASE)
+
 
 class DataValidator:
     """
@@ -63,6 +85,12 @@ class DataValidator:
         Returns:
             Dict no formato compatível
         """
+        # Atalho: formato obviamente inválido não precisa passar pelo validador completo
+        if isinstance(email, str):
+            email_limpo = email.strip()
+            if email_limpo and _EMAIL_RE.match(email_limpo) is None:
+                return {"valido": False, "erro": _ERRO_EMAIL_INVALIDO, "avisos": [], "dados": {}}
+        
         result = field_validator.validate_email_field(email, required=obrigatorio)
         return migration_wrapper.migrate_result_to_old_format(result)
     
@@ -129,6 +157,27 @@ class DataValidator:
         )
         return result.valid
     
+    @staticmethod
+    def validar_justificativas_eventos_batch(dfs_por_titulo: Dict[str, pd.DataFrame],
+                                            alteracoes_pendentes: Dict) -> Dict[str, Dict[str, Any]]:
+        """
+        NOVO - Validação de justificativas de vários eventos em uma chamada
+        
+        Args:
+            dfs_por_titulo: Dict {titulo_evento: DataFrame do evento}
+            alteracoes_pendentes: Alterações pendentes de todos os eventos
+            
+        Returns:
+            Dict {titulo_evento: {"valido", "erros"}} no formato de validar_justificativas_evento
+        """
+        resultados = business_validator.validate_eventos_justificativas_lote(
+            dfs_por_titulo, alteracoes_pendentes
+        )
+        return {
+            titulo: {"valido": result.valid, "erros": result.errors}
+            for titulo, result in resultados.items()
+        }
+    
     @staticmethod
     def validar_evento_completo(df_evento: pd.DataFrame, alteracoes_pendentes: Dict,
                                titulo_evento: str = "") -> Dict[str, Any]:
@@ -195,34 +244,26 @@ class DataValidator:
             "campos_com_erro": 0
         }
         
+        erros_append = resultado_consolidado["erros"].append
+        avisos_append = resultado_consolidado["avisos"].append
+        
         for nome_campo, config in campos.items():
-            tipo = config.get("tipo", "texto")
-            valor = config.get("valor")
-            params = config.get("params", {})
-            
-            if tipo == "email":
-                result = field_validator.validate_email_field(valor, **params)
-            elif tipo == "texto":
-                result = field_validator.validate_text_field(valor, nome_campo, **params)
-            elif tipo == "numero":
-                result = field_validator.validate_number_field(valor, nome_campo, **params)
-            elif tipo == "data_hora":
-                data = params.get("data", "")
-                hora = params.get("hora", "")
-                result = field_validator.validate_datetime_fields(data, hora, **params)
-            else:
+            validador = _VALIDADORES_POR_TIPO.get(config.get("tipo", "texto"))
+            if validador is None:
                 continue  # Tipo não suportado
             
+            result = validador(config.get("valor"), nome_campo, config.get("params", {}))
+            
             resultado_consolidado["campos_validados"] += 1
             
             if not result.valid:
                 resultado_consolidado["valido"] = False
                 resultado_consolidado["campos_com_erro"] += 1
                 for erro in result.errors:
-                    resultado_consolidado["erros"].append(f"{nome_campo}: {erro}")
+                    erros_append(f"{nome_campo}: {erro}")
             
             for aviso in result.warnings:
-                resultado_consolidado["avisos"].append(f"{nome_campo}: {aviso}")
+                avisos_append(f"{nome_campo}: {aviso}")
         
         return resultado_consolidado
     
@@ -254,13 +295,13 @@ def validar_campo_obrigatorio(valor: Any, nome_campo: str = "Campo") -> bool:
 
 def validar_motivo_observacao_rapido(motivo: str, observacao: str) -> bool:
     """Validação rápida de motivo + observação"""
-    result = business_validator.validate_motivo_observacao(motivo, observacao)
-    return result.valid
+    valido, _ = business_validator.verificar_motivo_observacao(motivo, observacao)
+    return valido
 
 def obter_mensagem_erro_validacao(motivo: str, observacao: str) -> str:
     """Obtém mensagem de erro específica para motivo + observação"""
-    result = business_validator.validate_motivo_observacao(motivo, observacao)
-    return result.errors[0] if result.errors else ""
+    _, erro = business_validator.verificar_motivo_observacao(motivo, observacao)
+    return erro
 
 def validar_data_brasileira(data_str: str) -> bool:
     """Validação rápida de data no formato brasileiro"""
@@ -306,17 +347,19 @@ class ValidadorAvancado:
             }
         }
         
+        tem_hora = "hora" in dados_formulario
+        
         for campo, valor in dados_formulario.items():
             resultado["resumo"]["total_campos"] += 1
             
-            # Detecta tipo do campo automaticamente
-            if "email" in campo.lower():
+            # Detecta tipo do campo automaticamente (prioridade: email, data, senha)
+            tipos_campo = {m.lower() for m in _TIPO_CAMPO_RE.findall(campo)}
+            if "email" in tipos_campo:
                 validation_result = self.field_validator.validate_email_field(valor, required=True)
-            elif "data" in campo.lower() and "hora" in dados_formulario:
+            elif "data" in tipos_campo and tem_hora:
                 # Pula se já processou data+hora
                 continue
-            elif "senha" in campo.lower():
-                from ..validators import security_validator
+            elif "senha" in tipos_campo:
                 validation_result = security_validator.validate_password_policy(valor)
             else:
                 # Default: texto
@@ -355,8 +398,12 @@ class ValidadorAvancado:
             "estatisticas": {}
         }
         
-        for idx, registro in enumerate(registros):
-            registro_resultado = self.validar_formulario_completo(registro)
+        # Só os registros reprovados na triagem vetorizada passam pela validação completa
+        indices_suspeitos = self._indices_registros_suspeitos(registros)
+        resultado["registros_validos"] = len(registros) - len(indices_suspeitos)
+        
+        for idx in indices_suspeitos:
+            registro_resultado = self.validar_formulario_completo(registros[idx])
             
             if registro_resultado["valido"]:
                 resultado["registros_validos"] += 1
@@ -377,6 +424,52 @@ class ValidadorAvancado:
         
         return resultado
 
+    
+    def _indices_registros_suspeitos(self, registros: list) -> List[int]:
+        """
+        Triagem em lote (coluna a coluna) dos registros que podem ter erro
+        
+        Aplica as mesmas regras de validar_formulario_completo sobre cada
+        coluna de uma vez. Lotes heterogêneos (registros com campos
+        diferentes) não são triados e retornam todos os índices.
+        
+        Args:
+            registros: Lista de dicionários com dados
+            
+        Returns:
+            List[int]: Índices dos registros que precisam de validação completa
+        """
+        if not registros:
+            return []
+        
+        # dtype=object preserva None/valores originais (sem conversão para NaN)
+        df = pd.DataFrame(registros, dtype=object)
+        total_campos = len(df.columns)
+        if any(len(registro) != total_campos for registro in registros):
+            return list(range(len(registros)))
+        
+        tem_hora = "hora" in df.columns
+        registro_valido = pd.Series(True, index=df.index)
+        
+        for campo in df.columns:
+            tipos_campo = {m.lower() for m in _TIPO_CAMPO_RE.findall(campo)}
+            if "data" in tipos_campo and "email" not in tipos_campo and tem_hora:
+                continue
+            
+            if "senha" in tipos_campo and "email" not in tipos_campo:
+                campo_valido = df[campo].map(
+                    lambda senha: security_validator.validate_password_policy(senha).valid
+                ).astype(bool)
+            else:
+                valores = df[campo].map(self.field_validator._ensure_string)
+                campo_valido = valores.ne("")
+                if "email" in tipos_campo:
+                    campo_valido &= valores.map(self.field_validator.patterns['email'].match).notna()
+            
+            registro_valido &= campo_valido
+        
+        return df.index[~registro_valido].tolist()
+
 
 # 🚀 INSTÂNCIA GLOBAL - Para uso direto
 validador_avancado = ValidadorAvancado()
\ No newline at end of file
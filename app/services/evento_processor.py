@@ -1,10 +1,11 @@
 """
 Processador de eventos - lógica de negócio para eventos - MIGRADO PARA VALIDAÇÕES CENTRALIZADAS
 """
+import numpy as np
 import pandas as pd
-import pytz
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 # NOVO: Import do processador de localização
 try:
@@ -13,8 +14,170 @@ try:
 except ImportError:
     LOCATION_PROCESSOR_AVAILABLE = False
 
+from ..config.settings import config
+from ..config.timezone_config import TZ_BRASILIA
+
 # 🚀 NOVA IMPORTAÇÃO - Usa sistema centralizado para validações
 from ..validators import business_validator
+from ..validators.field_validator import parse_data_hora_br, parse_data_hora_titulo
+
+
+# Palavras-chave (maiúsculas, busca por substring) do fallback de motivos por POI
+_PALAVRAS_MANUTENCAO = ("MANUTEN", "OFICINA")
+_PALAVRAS_TERMINAL = ("TERMINAL", "INOCÊNCIA")
+_PALAVRAS_FABRICA = ("FÁBRICA", "FABRICA")
+
+
+def _contem_alguma(texto: str, palavras: tuple) -> bool:
+    """Verifica se alguma das palavras-chave aparece no texto"""
+    return any(palavra in texto for palavra in palavras)
+
+
+# Valores (em minúsculas) tratados como não preenchidos no cálculo de status
+_MOTIVO_VAZIO = frozenset(("", "none", "— selecione —"))
+_PREVISAO_VAZIA = frozenset(("", "none"))
+
+
+def _pendente_vazio(valor: Any, vazios: frozenset) -> bool:
+    """Indica se um valor pendente conta como não preenchido"""
+    return str(valor).strip().lower() in vazios
+
+
+def _indexar_pendentes(alteracoes_pendentes: Dict, evento_titulo: str) -> Tuple[Dict, Dict]:
+    """
+    Índice das alterações pendentes do evento, em uma única passada
+    
+    Returns:
+        Tupla (motivos, previsoes) de dicts ID do registro → True se o valor
+        pendente não conta como preenchido, contendo apenas os registros
+        que alteraram o respectivo campo
+    """
+    prefixo = f"{evento_titulo}_"
+    tamanho_prefixo = len(prefixo)
+    motivos = {}
+    previsoes = {}
+    
+    for chave, alteracoes in alteracoes_pendentes.items():
+        if not chave.startswith(prefixo):
+            continue
+        row_id = chave[tamanho_prefixo:]
+        if "Motivo" in alteracoes:
+            motivos[row_id] = _pendente_vazio(alteracoes["Motivo"], _MOTIVO_VAZIO)
+        if "Previsao_Liberacao" in alteracoes:
+            previsoes[row_id] = _pendente_vazio(alteracoes["Previsao_Liberacao"], _PREVISAO_VAZIA)
+    
+    return motivos, previsoes
+
+
+def _mascara_nao_preenchido(df: pd.DataFrame, campo: str, vazios: frozenset,
+                            pendentes: Dict, ids_registro: pd.Series) -> np.ndarray:
+    """
+    Máscara booleana das linhas em que o campo não está preenchido,
+    considerando as alterações pendentes do evento
+    
+    Args:
+        df: DataFrame do evento
+        campo: Nome da coluna
+        vazios: Valores (minúsculos, sem espaços) tratados como não preenchidos
+        pendentes: ID do registro → True se o valor pendente não conta como preenchido
+        ids_registro: ID (string) de cada linha, ou None se não há pendências
+    """
+    if campo in df.columns:
+        mascara = df[campo].map(str).str.strip().str.lower().isin(vazios).to_numpy()
+    else:
+        mascara = np.ones(len(df), dtype=bool)
+    
+    if pendentes:
+        # Onde há valor pendente, ele substitui o valor atual da coluna
+        pendente_vazio = ids_registro.map(pendentes)
+        mascara = np.where(pendente_vazio.notna().to_numpy(), pendente_vazio.eq(True).to_numpy(), mascara)
+    
+    return mascara
+
+
+@lru_cache(maxsize=4096)
+def _parse_titulo_cached(titulo: str) -> Dict[str, Any]:
+    """
+    Parse do título memoizado por título (títulos se repetem entre linhas e atualizações da tela)
+    
+    O dict retornado fica no cache: não deve ser modificado (use parse_titulo_completo).
+    """
+    # NOVO: Usa processador de localização se disponível
+    if LOCATION_PROCESSOR_AVAILABLE:
+        return location_processor.parse_titulo_com_localizacao(titulo)
+    
+    # FALLBACK: Lógica original (apenas RRP) - ATUALIZADA
+    resultado = {
+        "titulo_original": titulo,
+        "localizacao": "RRP",  # Assume RRP como padrão
+        "tipo_amigavel": "",
+        "poi_amigavel": "",
+        "datahora_fmt": "",
+        "data_evento": None,
+        "valido": False
+    }
+    
+    try:
+        partes = titulo.split('_')
+        if len(partes) < 5:
+            return resultado
+        
+        tipo = partes[-3]
+        poi_raw = partes[1].upper()
+        data_str = partes[-2]
+        hora_str = partes[-1]
+        
+        # Mapeamento de POIs ATUALIZADO COM UNIDADE
+        poi_map = {
+            "PAAGUACLARA": "P.A. Água Clara - RRP",
+            "CARREGAMENTOFABRICARRP": "Carregamento Fábrica - RRP",
+            "CARREGAMENTOFABRICA": "Carregamento Fábrica - RRP",
+            "OFICINAJSL": "Manutenção - RRP",
+            "OFICINA": "Manutenção - RRP",
+            "TERMINALINOCENCIA": "Terminal Inocência - RRP",
+            "DESCARGAINOCENCIA": "Terminal Inocência - RRP"
+        }
+        
+        # Processa POI com fallback inteligente
+        poi_amigavel = poi_map.get(poi_raw)
+        if not poi_amigavel:
+            # Busca por substring
+            for key, value in poi_map.items():
+                if key in poi_raw or poi_raw in key:
+                    poi_amigavel = value
+                    break
+            else:
+                poi_amigavel = f"{poi_raw.title()} - RRP"
+        
+        # Mapeamento de tipos
+        tipo_map = {
+            "Informativo": "Alerta Informativo",
+            "N1": "Tratativa N1", "N2": "Tratativa N2",
+            "N3": "Tratativa N3", "N4": "Tratativa N4"
+        }
+        
+        # Processa tipo
+        tipo_amigavel = tipo_map.get(tipo, tipo)
+        
+        # Processa data/hora (validação explícita, sem exceção para títulos malformados)
+        data_evento = parse_data_hora_titulo(data_str, hora_str)
+        if data_evento is not None:
+            datahora_fmt = data_evento.strftime("%d/%m %H:00")
+        else:
+            datahora_fmt = f"{data_str} {hora_str}"
+        
+        resultado.update({
+            "tipo_amigavel": tipo_amigavel,
+            "poi_amigavel": poi_amigavel,
+            "datahora_fmt": datahora_fmt,
+            "data_evento": data_evento,
+            "valido": True
+        })
+        
+    except Exception:
+        pass
+    
+    return resultado
 
 
 class EventoProcessor:
@@ -23,89 +186,44 @@ class EventoProcessor:
     @staticmethod
     def parse_titulo_completo(titulo: str) -> Dict[str, Any]:
         """Parse completo do título do evento COM suporte a localização PADRONIZADA"""
+        # Cópia rasa: o resultado em cache é compartilhado e os valores são imutáveis
+        return dict(_parse_titulo_cached(titulo))
+    
+    @staticmethod
+    def parse_titulo_completo_batch(titulos: pd.Series) -> pd.DataFrame:
+        """
+        Parse em lote de uma coluna de títulos
         
-        # NOVO: Usa processador de localização se disponível
-        if LOCATION_PROCESSOR_AVAILABLE:
-            return location_processor.parse_titulo_com_localizacao(titulo)
-        
-        # FALLBACK: Lógica original (apenas RRP) - ATUALIZADA
-        resultado = {
-            "titulo_original": titulo,
-            "localizacao": "RRP",  # Assume RRP como padrão
-            "tipo_amigavel": "",
-            "poi_amigavel": "",
-            "datahora_fmt": "",
-            "data_evento": None,
-            "valido": False
-        }
+        Cada título distinto é processado uma única vez (mesmas regras de
+        parse_titulo_completo) e o resultado é expandido para todas as linhas.
         
-        try:
-            partes = titulo.split('_')
-            if len(partes) < 5:
-                return resultado
-            
-            tipo = partes[-3]
-            poi_raw = partes[1].upper()
-            data_str = partes[-2]
-            hora_str = partes[-1]
-            
-            # Mapeamento de POIs ATUALIZADO COM UNIDADE
-            poi_map = {
-                "PAAGUACLARA": "P.A. Água Clara - RRP",
-                "CARREGAMENTOFABRICARRP": "Carregamento Fábrica - RRP",
-                "CARREGAMENTOFABRICA": "Carregamento Fábrica - RRP",
-                "OFICINAJSL": "Manutenção - RRP",
-                "OFICINA": "Manutenção - RRP",
-                "TERMINALINOCENCIA": "Terminal Inocência - RRP",
-                "DESCARGAINOCENCIA": "Terminal Inocência - RRP"
-            }
-            
-            # Processa POI com fallback inteligente
-            poi_amigavel = poi_map.get(poi_raw)
-            if not poi_amigavel:
-                # Busca por substring
-                for key, value in poi_map.items():
-                    if key in poi_raw or poi_raw in key:
-                        poi_amigavel = value
-                        break
-                else:
-                    poi_amigavel = f"{poi_raw.title()} - RRP"
-            
-            # Mapeamento de tipos
-            tipo_map = {
-                "Informativo": "Alerta Informativo",
-                "N1": "Tratativa N1", "N2": "Tratativa N2",
-                "N3": "Tratativa N3", "N4": "Tratativa N4"
-            }
-            
-            # Processa tipo
-            tipo_amigavel = tipo_map.get(tipo, tipo)
-            
-            # Processa data/hora
-            try:
-                datahora = datetime.strptime(data_str + "_" + hora_str, "%d%m%Y_%H%M%S")
-                datahora_fmt = datahora.strftime("%d/%m %H:00")
-                data_evento = datahora
-            except:
-                datahora_fmt = f"{data_str} {hora_str}"
-                data_evento = None
-            
-            resultado.update({
-                "tipo_amigavel": tipo_amigavel,
-                "poi_amigavel": poi_amigavel,
-                "datahora_fmt": datahora_fmt,
-                "data_evento": data_evento,
-                "valido": True
-            })
+        Args:
+            titulos: Series com os títulos dos eventos
             
-        except Exception:
-            pass
+        Returns:
+            DataFrame alinhado ao índice de entrada, uma coluna por chave do parse
+            (titulo_original, localizacao, tipo_amigavel, poi_amigavel, ...)
+        """
+        if titulos.empty:
+            return pd.DataFrame(index=titulos.index)
         
-        return resultado
+        codigos, titulos_unicos = pd.factorize(titulos, use_na_sentinel=False)
+        df_unicos = pd.DataFrame([_parse_titulo_cached(titulo) for titulo in titulos_unicos])
+        
+        df_parse = df_unicos.take(codigos)
+        df_parse.index = titulos.index
+        return df_parse
 
     @staticmethod
-    def calcular_tempo_decorrido(data_entrada: str) -> Dict[str, Any]:
-        """Calcula tempo decorrido desde a entrada (sem alterações)"""
+    def calcular_tempo_decorrido(data_entrada: str, agora: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Calcula tempo decorrido desde a entrada (sem alterações)
+        
+        Args:
+            data_entrada: Data/hora de entrada ("dd/mm/aaaa HH:MM" ou formato ISO)
+            agora: Instante de referência já localizado - permite que chamadas em
+                lote calculem o "agora" uma única vez (padrão: hora atual)
+        """
         resultado = {
             "horas": 0,
             "texto_formatado": "0h",
@@ -117,21 +235,26 @@ class EventoProcessor:
             return resultado
         
         try:
-            agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+            if agora is None:
+                agora = datetime.now(TZ_BRASILIA)
             
             # Parse da data de entrada
             if "/" in str(data_entrada):
-                dt_entrada = datetime.strptime(str(data_entrada).strip(), "%d/%m/%Y %H:%M")
-                dt_entrada = pytz.timezone("America/Campo_Grande").localize(dt_entrada)
+                dt_entrada = parse_data_hora_br(str(data_entrada).strip())
+                dt_entrada = TZ_BRASILIA.localize(dt_entrada)
             else:
-                dt_entrada = pd.to_datetime(data_entrada, errors="coerce")
-                if pd.isnull(dt_entrada):
-                    return resultado
+                # Timestamps ISO do SharePoint: fromisoformat (C) antes da inferência do pandas
+                try:
+                    dt_entrada = datetime.fromisoformat(str(data_entrada).strip())
+                except ValueError:
+                    dt_entrada = pd.to_datetime(data_entrada, errors="coerce")
+                    if pd.isnull(dt_entrada):
+                        return resultado
                 
                 if dt_entrada.tzinfo is None:
-                    dt_entrada = pytz.timezone("America/Campo_Grande").localize(dt_entrada)
+                    dt_entrada = TZ_BRASILIA.localize(dt_entrada)
                 else:
-                    dt_entrada = dt_entrada.tz_convert("America/Campo_Grande")
+                    dt_entrada = dt_entrada.astimezone(TZ_BRASILIA)
             
             # Calcula diferença
             diferenca = agora - dt_entrada
@@ -185,15 +308,15 @@ class EventoProcessor:
             return location_processor.obter_motivos_por_poi_e_localizacao(poi_amigavel, localizacao)
         
         # FALLBACK: Lógica original
-        from ..config.settings import config
+        poi_upper = poi_amigavel.upper()
         
         if "P.A. Água Clara" in poi_amigavel:
             return config.motivos_poi["PA Agua Clara"]
-        elif "MANUTEN" in poi_amigavel.upper() or "OFICINA" in poi_amigavel.upper():
+        elif _contem_alguma(poi_upper, _PALAVRAS_MANUTENCAO):
             return config.motivos_poi["Manutenção"]
-        elif "TERMINAL" in poi_amigavel.upper() or "INOCÊNCIA" in poi_amigavel.upper():
+        elif _contem_alguma(poi_upper, _PALAVRAS_TERMINAL):
             return config.motivos_poi["Terminal"]
-        elif "FÁBRICA" in poi_amigavel.upper() or "FABRICA" in poi_amigavel.upper():
+        elif _contem_alguma(poi_upper, _PALAVRAS_FABRICA):
             return config.motivos_poi["Fábrica"]
         else:
             return ["Outros"]
@@ -218,6 +341,42 @@ class EventoProcessor:
         
         return validation_result.valid
     
+    @staticmethod
+    def validar_acesso_usuario_many(pois: Iterable[str], areas_usuario: List[str],
+                                    localizacao: str = "RRP") -> np.ndarray:
+        """
+        Versão em lote de validar_acesso_usuario
+        
+        Cada POI distinto é validado uma única vez (eventos da mesma área
+        repetem o POI), com as mesmas regras da validação individual. Um POI
+        cuja validação falha (exceção) fica sem acesso, sem derrubar o lote.
+        
+        Args:
+            pois: POIs amigáveis dos eventos
+            areas_usuario: Lista de áreas do usuário
+            localizacao: Código da localização (RRP/TLS)
+            
+        Returns:
+            np.ndarray[bool] alinhado com pois - True onde o usuário tem acesso
+        """
+        pois = list(pois)
+        mascara = np.zeros(len(pois), dtype=bool)
+        if not areas_usuario:
+            return mascara
+        
+        acesso_por_poi = {}
+        for i, poi_amigavel in enumerate(pois):
+            tem_acesso = acesso_por_poi.get(poi_amigavel)
+            if tem_acesso is None:
+                try:
+                    tem_acesso = EventoProcessor.validar_acesso_usuario(poi_amigavel, areas_usuario, localizacao)
+                except Exception:
+                    tem_acesso = False
+                acesso_por_poi[poi_amigavel] = tem_acesso
+            mascara[i] = tem_acesso
+        
+        return mascara
+    
     @staticmethod
     def calcular_status_evento(df_evento: pd.DataFrame, alteracoes_pendentes: Dict) -> str:
         """Calcula status do evento baseado no preenchimento de TODOS os registros (sem alterações)"""
@@ -226,43 +385,24 @@ class EventoProcessor:
 
         evento_titulo = df_evento["Titulo"].iloc[0] if "Titulo" in df_evento.columns else ""
         
-        # Verifica se TODOS os registros estão preenchidos
-        for _, row in df_evento.iterrows():
-            row_id = str(row["ID"]).strip()
-            chave_alteracao = f"{evento_titulo}_{row_id}"
-
-            # Valores atuais - normalização mais robusta
-            motivo_atual = str(row.get("Motivo", "")).strip()
-            previsao_atual = str(row.get("Previsao_Liberacao", "")).strip()
-
-            # Normaliza valores "None" e "— Selecione —"
-            if motivo_atual.lower() in ("none", "— selecione —"):
-                motivo_atual = ""
-            if previsao_atual.lower() in ("none", ""):
-                previsao_atual = ""
-
-            # Aplica alterações pendentes
-            if chave_alteracao in alteracoes_pendentes:
-                alteracoes = alteracoes_pendentes[chave_alteracao]
-                if "Motivo" in alteracoes:
-                    motivo_pendente = str(alteracoes["Motivo"]).strip()
-                    if motivo_pendente.lower() in ("none", "— selecione —"):
-                        motivo_atual = ""
-                    else:
-                        motivo_atual = motivo_pendente
-                if "Previsao_Liberacao" in alteracoes:
-                    previsao_pendente = str(alteracoes["Previsao_Liberacao"]).strip()
-                    if previsao_pendente.lower() in ("none", ""):
-                        previsao_atual = ""
-                    else:
-                        previsao_atual = previsao_pendente
-
-            # Se qualquer registro não estiver completo, retorna "Pendente"
-            motivo_ok = motivo_atual and motivo_atual.strip() != ""
-            previsao_ok = previsao_atual and previsao_atual.strip() != ""
-            
-            if not (motivo_ok and previsao_ok):
-                return "Pendente"
+        # Alterações pendentes deste evento, já classificadas e indexadas pelo ID do registro
+        motivos_pendentes, previsoes_pendentes = _indexar_pendentes(alteracoes_pendentes, evento_titulo)
+        if motivos_pendentes or previsoes_pendentes:
+            ids_registro = df_evento["ID"].map(str).str.strip()
+        else:
+            ids_registro = None
+        
+        # Máscaras de não preenchimento (com alterações pendentes aplicadas) - operações booleanas por coluna
+        motivo_vazio = _mascara_nao_preenchido(
+            df_evento, "Motivo", _MOTIVO_VAZIO, motivos_pendentes, ids_registro
+        )
+        previsao_vazia = _mascara_nao_preenchido(
+            df_evento, "Previsao_Liberacao", _PREVISAO_VAZIA, previsoes_pendentes, ids_registro
+        )
+        
+        # Se qualquer registro não estiver completo, retorna "Pendente"
+        if (motivo_vazio | previsao_vazia).any():
+            return "Pendente"
 
         # Se chegou aqui, todos os registros estão completos
         return "Preenchido"
\ No newline at end of file
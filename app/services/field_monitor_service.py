@@ -2,11 +2,32 @@
 Field Monitor Service - Monitora alterações em campos para controlar auto-refresh
 Localização: app/services/field_monitor_service.py
 """
+from contextlib import contextmanager
 from typing import Dict, Any, Set, Callable, Optional
 from ..config.logging_config import setup_logger
 
+# Mensagens de debug usam argumentos "%s" (formatação adiada): são emitidas a cada
+# digitação e descartadas no nível INFO padrão
 logger = setup_logger("field_monitor")
 
+# Tipos em que valores iguais (==) sempre têm a mesma representação str()
+_TIPOS_IGUALDADE_DIRETA = frozenset((str, int, bool))
+
+
+def _normalizar_valor_campo(valor: Any) -> str:
+    """Forma de comparação de um valor de campo (None → "", texto sem espaços nas bordas)"""
+    return "" if valor is None else str(valor).strip()
+
+
+def _callback_seguro(callback: Callable[[bool], None]) -> Callable[[bool], None]:
+    """Envolve o callback de mudança de estado: erros são registrados e não se propagam"""
+    def chamar(tem_alteracoes: bool):
+        try:
+            callback(tem_alteracoes)
+        except Exception as e:
+            logger.error(f"❌ Erro ao notificar mudança de estado: {e}")
+    return chamar
+
 
 class FieldMonitorService:
     """Serviço para monitorar alterações em campos da interface"""
@@ -18,6 +39,9 @@ class FieldMonitorService:
         # Valores originais dos campos (para comparação)
         self.valores_originais: Dict[str, Any] = {}
         
+        # Forma normalizada dos valores originais (calculada uma vez por registro)
+        self._originais_norm: Dict[str, str] = {}
+        
         # Valores atuais dos campos
         self.valores_atuais: Dict[str, Any] = {}
         
@@ -27,14 +51,24 @@ class FieldMonitorService:
         # Estado anterior (para detectar transições)
         self.tinha_alteracoes_anterior = False
         
+        # Profundidade de operações em lote (notificações adiadas enquanto > 0)
+        self._lotes_ativos = 0
+        
     def configurar_callback(self, callback: Callable[[bool], None]):
         """
         Configura callback que será chamado quando estado de alterações mudar
         
         Args:
             callback: Função que recebe bool (True = tem alterações, False = sem alterações)
+                ou None para remover o callback
+        
+        Raises:
+            TypeError: Se callback não for chamável
         """
-        self.callback_mudanca_estado = callback
+        # Validado e envolvido uma única vez aqui, e não a cada notificação
+        if callback is not None and not callable(callback):
+            raise TypeError(f"Callback deve ser chamável, recebido: {type(callback).__name__}")
+        self.callback_mudanca_estado = _callback_seguro(callback) if callback is not None else None
     
     def registrar_campo_original(self, campo_id: str, valor: Any):
         """
@@ -45,13 +79,15 @@ class FieldMonitorService:
             valor: Valor original/inicial do campo
         """
         self.valores_originais[campo_id] = valor
+        self._originais_norm[campo_id] = _normalizar_valor_campo(valor)
         self.valores_atuais[campo_id] = valor
         
-        # Remove das alterações se estava marcado
-        self.campos_alterados.discard(campo_id)
+        logger.debug("📝 Campo registrado: %s = '%s'", campo_id, valor)
         
-        logger.debug(f"📝 Campo registrado: {campo_id} = '{valor}'")
-        self._verificar_mudanca_estado()
+        # Remove das alterações se estava marcado (só então o estado pode mudar)
+        if campo_id in self.campos_alterados:
+            self.campos_alterados.remove(campo_id)
+            self._verificar_mudanca_estado()
     
     def registrar_alteracao(self, campo_id: str, novo_valor: Any):
         """
@@ -67,19 +103,50 @@ class FieldMonitorService:
         # Obtém valor original (default para None se não existir)
         valor_original = self.valores_originais.get(campo_id)
         
-        # Compara valores para determinar se houve alteração
-        if self._valores_diferentes(valor_original, novo_valor):
-            # Tem alteração
-            if campo_id not in self.campos_alterados:
-                self.campos_alterados.add(campo_id)
-                logger.debug(f"✏️ Campo alterado: {campo_id} ('{valor_original}' → '{novo_valor}')")
+        # Compara com a forma normalizada do original (já calculada no registro)
+        alterado = self._valores_diferentes(
+            novo_valor, valor_original, self._originais_norm.get(campo_id, "")
+        )
+        
+        # add/discard são idempotentes: a transição é detectada pelo tamanho do conjunto
+        # e o estado global só é reavaliado quando ele muda
+        total_antes = len(self.campos_alterados)
+        if alterado:
+            self.campos_alterados.add(campo_id)
         else:
-            # Voltou ao valor original
-            if campo_id in self.campos_alterados:
-                self.campos_alterados.remove(campo_id)
-                logger.debug(f"↶ Campo restaurado: {campo_id} = '{valor_original}'")
+            self.campos_alterados.discard(campo_id)
+        
+        if len(self.campos_alterados) != total_antes:
+            if alterado:
+                logger.debug("✏️ Campo alterado: %s ('%s' → '%s')", campo_id, valor_original, novo_valor)
+            else:
+                logger.debug("↶ Campo restaurado: %s = '%s'", campo_id, valor_original)
+            self._verificar_mudanca_estado()
+    
+    def registrar_alteracoes_lote(self, alteracoes: Dict[str, Any]):
+        """
+        Registra alterações em vários campos com no máximo uma notificação
         
-        self._verificar_mudanca_estado()
+        Args:
+            alteracoes: Dict campo_id → novo valor
+        """
+        with self.lote():
+            for campo_id, novo_valor in alteracoes.items():
+                self.registrar_alteracao(campo_id, novo_valor)
+    
+    @contextmanager
+    def lote(self):
+        """
+        Agrupa operações: a mudança de estado é avaliada (e o callback
+        chamado) uma única vez, ao final do bloco mais externo
+        """
+        self._lotes_ativos += 1
+        try:
+            yield self
+        finally:
+            self._lotes_ativos -= 1
+            if not self._lotes_ativos:
+                self._verificar_mudanca_estado()
     
     def limpar_alteracoes(self):
         """Limpa todas as alterações (quando dados são salvos/cancelados)"""
@@ -89,6 +156,10 @@ class FieldMonitorService:
             
             # Atualiza valores originais com os atuais
             self.valores_originais.update(self.valores_atuais)
+            self._originais_norm.update(
+                (campo_id, _normalizar_valor_campo(valor))
+                for campo_id, valor in self.valores_atuais.items()
+            )
             
             self._verificar_mudanca_estado()
     
@@ -101,11 +172,12 @@ class FieldMonitorService:
         """
         if campo_id in self.campos_alterados:
             self.campos_alterados.remove(campo_id)
-            logger.debug(f"🧹 Campo limpo: {campo_id}")
+            logger.debug("🧹 Campo limpo: %s", campo_id)
             
             # Atualiza valor original com o atual
             if campo_id in self.valores_atuais:
                 self.valores_originais[campo_id] = self.valores_atuais[campo_id]
+                self._originais_norm[campo_id] = _normalizar_valor_campo(self.valores_atuais[campo_id])
             
             self._verificar_mudanca_estado()
     
@@ -116,7 +188,7 @@ class FieldMonitorService:
         Returns:
             True se há campos alterados, False caso contrário
         """
-        return len(self.campos_alterados) > 0
+        return bool(self.campos_alterados)
     
     def obter_campos_alterados(self) -> Set[str]:
         """
@@ -127,27 +199,35 @@ class FieldMonitorService:
         """
         return self.campos_alterados.copy()
     
-    def obter_resumo_alteracoes(self) -> Dict[str, Any]:
+    def obter_resumo_alteracoes(self, incluir_detalhes: bool = True) -> Dict[str, Any]:
         """
         Obtém resumo das alterações atuais
         
+        Args:
+            incluir_detalhes: Se False, omite o dict "detalhes" (consultas de
+                estado frequentes não precisam montar os pares original/atual)
+        
         Returns:
             Dict com informações sobre alterações
         """
-        alteracoes_detalhadas = {}
-        
-        for campo_id in self.campos_alterados:
-            alteracoes_detalhadas[campo_id] = {
-                "valor_original": self.valores_originais.get(campo_id),
-                "valor_atual": self.valores_atuais.get(campo_id)
-            }
-        
-        return {
+        resumo = {
             "total_campos_alterados": len(self.campos_alterados),
-            "tem_alteracoes": self.has_alteracoes_pendentes(),
+            "tem_alteracoes": bool(self.campos_alterados),
             "campos_alterados": list(self.campos_alterados),
-            "detalhes": alteracoes_detalhadas
         }
+        
+        if incluir_detalhes:
+            originais = self.valores_originais.get
+            atuais = self.valores_atuais.get
+            resumo["detalhes"] = {
+                campo_id: {
+                    "valor_original": originais(campo_id),
+                    "valor_atual": atuais(campo_id)
+                }
+                for campo_id in self.campos_alterados
+            }
+        
+        return resumo
     
     def resetar_campo_para_original(self, campo_id: str):
         """
@@ -159,10 +239,11 @@ class FieldMonitorService:
         if campo_id in self.valores_originais:
             valor_original = self.valores_originais[campo_id]
             self.valores_atuais[campo_id] = valor_original
-            self.campos_alterados.discard(campo_id)
             
-            logger.debug(f"↶ Campo resetado: {campo_id} = '{valor_original}'")
-            self._verificar_mudanca_estado()
+            logger.debug("↶ Campo resetado: %s = '%s'", campo_id, valor_original)
+            if campo_id in self.campos_alterados:
+                self.campos_alterados.remove(campo_id)
+                self._verificar_mudanca_estado()
             
             return valor_original
         
@@ -173,29 +254,40 @@ class FieldMonitorService:
         if self.campos_alterados:
             logger.info(f"↶ Resetando {len(self.campos_alterados)} campo(s)")
             
-            for campo_id in list(self.campos_alterados):
-                self.resetar_campo_para_original(campo_id)
+            with self.lote():
+                for campo_id in list(self.campos_alterados):
+                    self.resetar_campo_para_original(campo_id)
     
-    def _valores_diferentes(self, valor1: Any, valor2: Any) -> bool:
+    def _valores_diferentes(self, valor1: Any, valor2: Any, valor2_norm: Optional[str] = None) -> bool:
         """
         Compara dois valores considerando tipos e casos especiais
         
         Args:
             valor1: Primeiro valor
             valor2: Segundo valor
+            valor2_norm: Forma normalizada de valor2, se já conhecida
             
         Returns:
             True se valores são diferentes, False se iguais
         """
-        # Converte None para string vazia para comparação
-        val1 = "" if valor1 is None else str(valor1).strip()
-        val2 = "" if valor2 is None else str(valor2).strip()
+        # Atalhos: mesmo objeto, ou mesmo tipo cuja igualdade implica mesmo str()
+        # (float fica de fora: 0.0 == -0.0, mas str() difere)
+        if valor1 is valor2:
+            return False
+        tipo = type(valor1)
+        if tipo is type(valor2) and tipo in _TIPOS_IGUALDADE_DIRETA and valor1 == valor2:
+            return False
         
-        return val1 != val2
+        if valor2_norm is None:
+            valor2_norm = _normalizar_valor_campo(valor2)
+        return _normalizar_valor_campo(valor1) != valor2_norm
     
     def _verificar_mudanca_estado(self):
         """Verifica se estado de alterações mudou e notifica via callback"""
-        tem_alteracoes_agora = self.has_alteracoes_pendentes()
+        if self._lotes_ativos:
+            return
+        
+        tem_alteracoes_agora = bool(self.campos_alterados)
         
         # Só notifica se houve mudança de estado
         if tem_alteracoes_agora != self.tinha_alteracoes_anterior:
@@ -206,12 +298,10 @@ class FieldMonitorService:
             else:
                 logger.info("✅ Todas alterações foram salvas/limpas")
             
-            # Chama callback se configurado
-            if self.callback_mudanca_estado:
-                try:
-                    self.callback_mudanca_estado(tem_alteracoes_agora)
-                except Exception as e:
-                    logger.error(f"❌ Erro ao notificar mudança de estado: {e}")
+            # Chama callback se configurado (já validado e protegido em configurar_callback)
+            callback = self.callback_mudanca_estado
+            if callback is not None:
+                callback(tem_alteracoes_agora)
 
 
 # Instância global (será inicializada no session_state)
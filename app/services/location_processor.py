@@ -1,12 +1,42 @@
 """
 Processador de Localização - Suporte para RRP e TLS - MAPEAMENTO COMPLETO ATUALIZADO
 """
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from ..config.logging_config import setup_logger
+from ..validators.field_validator import parse_data_hora_titulo
 
 logger = setup_logger("location_processor")
 
 
+@lru_cache(maxsize=256)
+def _pois_permitidos_por_areas(areas_usuario: Tuple[str, ...]) -> frozenset:
+    """
+    União dos POIs reais liberados para as áreas do usuário (normalizadas)
+    
+    Memoizada: as mesmas áreas são validadas contra cada evento da tela.
+    """
+    pois_permitidos = set()
+    for area in areas_usuario:
+        pois_permitidos.update(LocationProcessor.MAPEAMENTO_ACESSO.get(area.strip().lower(), ()))
+    return frozenset(pois_permitidos)
+
+
+@lru_cache(maxsize=256)
+def _categoria_motivos_poi(poi_amigavel: str) -> Optional[str]:
+    """
+    Categoria de motivos do POI (chave de MOTIVOS_BASE), ou None se não reconhecido
+    
+    Memoizada: há poucos POIs distintos, então a busca por palavras-chave
+    roda uma vez por POI em vez de a cada evento exibido.
+    """
+    poi_upper = poi_amigavel.upper()
+    for categoria, palavras in LocationProcessor.PALAVRAS_CATEGORIA_POI:
+        if any(palavra in poi_upper for palavra in palavras):
+            return categoria
+    return None
+
+
 class LocationProcessor:
     """Processador para diferentes localizações (RRP, TLS) com mapeamento completo"""
     
@@ -53,6 +83,112 @@ class LocationProcessor:
         }
     }
     
+    # MAPEAMENTO EXATO conforme especificado: área do usuário (normalizada) → POIs reais
+    MAPEAMENTO_ACESSO = {
+        "geral": frozenset(("*",)),  # Vê todos
+        "pa agua clara rrp": frozenset(("PA AGUA CLARA",)),
+        "terminal rrp": frozenset(("Descarga Inocencia",)),
+        "fábrica rrp": frozenset(("Carregamento Fabrica RRP",)),
+        "fabrica rrp": frozenset(("Carregamento Fabrica RRP",)),
+        "manutenção rrp": frozenset(("Oficina JSL",)),
+        "manutencao rrp": frozenset(("Oficina JSL",)),
+        "fábrica tls": frozenset(("Carregamento Fabrica",)),
+        "fabrica tls": frozenset(("Carregamento Fabrica",)),
+        "pa celulose tls": frozenset(("PA Celulose",)),
+        "terminal tls": frozenset(("Descarga TAP",))
+    }
+    
+    # MAPEAMENTO: Nome amigável (normalizado) → POI real da coluna PontodeInteresse
+    MAPEAMENTO_POI_REAL = {
+        # P.A.
+        "p.a. água clara - rrp": "PA AGUA CLARA",
+        "p.a. agua clara - rrp": "PA AGUA CLARA",
+        "p.a. celulose - tls": "PA Celulose",
+        
+        # Carregamento/Fábrica
+        "carregamento fábrica - rrp": "Carregamento Fabrica RRP",
+        "carregamento fabrica - rrp": "Carregamento Fabrica RRP",
+        "carregamento fábrica - tls": "Carregamento Fabrica",
+        "carregamento fabrica - tls": "Carregamento Fabrica",
+        
+        # Terminal
+        "terminal inocência - rrp": "Descarga Inocencia",
+        "terminal inocencia - rrp": "Descarga Inocencia",
+        "terminal aparecida - tls": "Descarga TAP",
+        
+        # Manutenção
+        "manutenção - rrp": "Oficina JSL",
+        "manutencao - rrp": "Oficina JSL",
+        "manutenção - tls": "Manutencao TLS",
+        "manutencao - tls": "Manutencao TLS"
+    }
+    
+    # Motivos base (aplicam para todas as localizações)
+    MOTIVOS_BASE = {
+        "PA_AGUA_CLARA": [
+            "Atestado Motorista",
+            "Brecha na escala", 
+            "Ciclo Antecipado - Aguardando Motorista", 
+            "Falta Motorista",
+            "Outros", 
+            "Refeição", 
+            "Socorro Mecânico"
+        ],
+        "MANUTENCAO": [
+            "Corretiva",
+            "Falta Mecânico",
+            "Falta Material", 
+            "Inspeção", 
+            "Lavagem", 
+            "Preventiva", 
+            "Outros"
+        ],
+        "TERMINAL": [
+            "Chegada em Comboio", 
+            "Falta de Espaço", 
+            "Falta de Máquina", 
+            "Falta de Operador", 
+            "Janela de Descarga",
+            "Prioridade Ferrovia",
+            "Outros"
+        ],
+        "FABRICA": [
+            "Chegada em Comboio", 
+            "Emissão Nota Fiscal", 
+            "Falta de Máquina", 
+            "Falta de Material", 
+            "Falta de Operador", 
+            "Janela Carregamento", 
+            "Outros",
+            "Restrição de Tráfego"
+        ]
+    }
+    
+    # Detecção do tipo de POI: palavras-chave (maiúsculas) avaliadas em ordem de prioridade
+    PALAVRAS_CATEGORIA_POI = (
+        ("PA_AGUA_CLARA", ("P.A.", "AGUA CLARA", "CELULOSE")),
+        ("MANUTENCAO", ("MANUTENÇÃO", "MANUTENCAO")),
+        ("TERMINAL", ("TERMINAL", "APARECIDA", "INOCÊNCIA")),
+        ("FABRICA", ("FÁBRICA", "FABRICA", "CARREGAMENTO")),
+    )
+    
+    # Padrões de fallback do POI raw, em ordem de prioridade (o primeiro contido vence).
+    # Os nomes são formatados só para o padrão encontrado.
+    PADROES_POI = (
+        # P.A. / Pátios
+        ("PA", "P.A. {unidade} - {localizacao}"),
+        ("PATIO", "P.A. {unidade} - {localizacao}"),
+        # Carregamento/Fábrica
+        ("CARREGAMENTO", "Carregamento Fábrica - {localizacao}"),
+        ("FABRICA", "Carregamento Fábrica - {localizacao}"),
+        # Descarga/Terminal
+        ("DESCARGA", "Terminal {terminal} - {localizacao}"),
+        ("TERMINAL", "Terminal {terminal} - {localizacao}"),
+        # Manutenção/Oficina
+        ("OFICINA", "Manutenção - {localizacao}"),
+        ("MANUTENCAO", "Manutenção - {localizacao}"),
+    )
+    
     @staticmethod
     def extrair_localizacao_do_titulo(titulo: str) -> str:
         """
@@ -136,15 +272,12 @@ class LocationProcessor:
             }
             tipo_amigavel = tipo_map.get(tipo, tipo)
             
-            # Processa data/hora
-            try:
-                from datetime import datetime
-                datahora = datetime.strptime(data_str + "_" + hora_str, "%d%m%Y_%H%M%S")
-                datahora_fmt = datahora.strftime("%d/%m %H:00")
-                data_evento = datahora
-            except:
+            # Processa data/hora (validação explícita, sem exceção para títulos malformados)
+            data_evento = parse_data_hora_titulo(data_str, hora_str)
+            if data_evento is not None:
+                datahora_fmt = data_evento.strftime("%d/%m %H:00")
+            else:
                 datahora_fmt = f"{data_str} {hora_str}"
-                data_evento = None
             
             resultado.update({
                 "tipo_amigavel": tipo_amigavel,
@@ -182,29 +315,14 @@ class LocationProcessor:
                 return value
         
         # 3. Mapeamento por padrões específicos
-        poi_patterns = {
-            # P.A. / Pátios
-            "PA": f"P.A. {LocationProcessor._get_unit_name(localizacao)} - {localizacao}",
-            "PATIO": f"P.A. {LocationProcessor._get_unit_name(localizacao)} - {localizacao}",
-            
-            # Carregamento/Fábrica
-            "CARREGAMENTO": f"Carregamento Fábrica - {localizacao}",
-            "FABRICA": f"Carregamento Fábrica - {localizacao}",
-            
-            # Descarga/Terminal
-            "DESCARGA": f"Terminal {LocationProcessor._get_terminal_name(localizacao)} - {localizacao}",
-            "TERMINAL": f"Terminal {LocationProcessor._get_terminal_name(localizacao)} - {localizacao}",
-            
-            # Manutenção/Oficina
-            "OFICINA": f"Manutenção - {localizacao}",
-            "MANUTENCAO": f"Manutenção - {localizacao}"
-        }
-        
-        # Busca por padrões
         poi_upper = poi_raw.upper()
-        for pattern, formatted_name in poi_patterns.items():
+        for pattern, modelo in LocationProcessor.PADROES_POI:
             if pattern in poi_upper:
-                return formatted_name
+                return modelo.format(
+                    unidade=LocationProcessor._get_unit_name(localizacao),
+                    terminal=LocationProcessor._get_terminal_name(localizacao),
+                    localizacao=localizacao
+                )
         
         # 4. Fallback - nome com localização
         return f"{poi_raw.title()} - {localizacao}"
@@ -237,144 +355,20 @@ class LocationProcessor:
         Returns:
             Lista de motivos disponíveis
         """
-        # Motivos base (aplicam para todas as localizações)
-        motivos_base = {
-            "PA_AGUA_CLARA": [
-                "Atestado Motorista",
-                "Brecha na escala", 
-                "Ciclo Antecipado - Aguardando Motorista", 
-                "Falta Motorista",
-                "Outros", 
-                "Refeição", 
-                "Socorro Mecânico"
-            ],
-            "MANUTENCAO": [
-                "Corretiva",
-                "Falta Mecânico",
-                "Falta Material", 
-                "Inspeção", 
-                "Lavagem", 
-                "Preventiva", 
-                "Outros"
-            ],
-            "TERMINAL": [
-                "Chegada em Comboio", 
-                "Falta de Espaço", 
-                "Falta de Máquina", 
-                "Falta de Operador", 
-                "Janela de Descarga",
-                "Prioridade Ferrovia",
-                "Outros"
-            ],
-            "FABRICA": [
-                "Chegada em Comboio", 
-                "Emissão Nota Fiscal", 
-                "Falta de Máquina", 
-                "Falta de Material", 
-                "Falta de Operador", 
-                "Janela Carregamento", 
-                "Outros",
-                "Restrição de Tráfego"
-            ]
-        }
-        
-        # Detecta tipo baseado no POI
-        poi_upper = poi_amigavel.upper()
-        
-        if "P.A." in poi_upper or "AGUA CLARA" in poi_upper or "CELULOSE" in poi_upper:
-            motivos = motivos_base["PA_AGUA_CLARA"]
-        elif "MANUTENÇÃO" in poi_upper or "MANUTENCAO" in poi_upper:
-            motivos = motivos_base["MANUTENCAO"]
-        elif "TERMINAL" in poi_upper or "APARECIDA" in poi_upper or "INOCÊNCIA" in poi_upper:
-            motivos = motivos_base["TERMINAL"]
-        elif "FÁBRICA" in poi_upper or "FABRICA" in poi_upper or "CARREGAMENTO" in poi_upper:
-            motivos = motivos_base["FABRICA"]
-        else:
-            motivos = ["Outros"]
+        categoria = _categoria_motivos_poi(poi_amigavel)
+        if categoria is None:
+            return ["Outros"]
         
-        return motivos
+        # Cópia: a lista devolvida pertence ao chamador
+        return list(LocationProcessor.MOTIVOS_BASE[categoria])
     
-    @staticmethod
-    def validar_acesso_usuario_por_localizacao(
-        poi_amigavel: str, 
-        localizacao: str, 
-        areas_usuario: List[str]
-    ) -> bool:
-        """
-        Validação EXATA baseada no mapeamento definido
-        Área do usuário → Ponto de Interesse específico
-        """
-        if not areas_usuario:
-            return False
-        
-        # MAPEAMENTO EXATO conforme especificado
-        MAPEAMENTO_ACESSO = {
-            "geral": ["*"],  # Vê todos
-            "pa agua clara rrp": ["PA AGUA CLARA"],
-            "terminal rrp": ["Descarga Inocencia"],
-            "fábrica rrp": ["Carregamento Fabrica RRP"],
-            "fabrica rrp": ["Carregamento Fabrica RRP"],
-            "manutenção rrp": ["Manutencao RRP"],
-            "manutencao rrp": ["Manutencao RRP"],
-            "fábrica tls": ["Carregamento Fabrica"],
-            "fabrica tls": ["Carregamento Fabrica"],
-            "pa celulose tls": ["PA Celulose"],
-            "terminal tls": ["Descarga TAP"]
-        }
-        
-        # Normaliza áreas do usuário
-        areas_normalizadas = [area.strip().lower() for area in areas_usuario]
-        
-        # Extrai POI real do evento
-        poi_real = LocationProcessor._extrair_poi_real_do_evento(poi_amigavel)
-        
-        # Verifica cada área do usuário
-        for area_usuario in areas_normalizadas:
-            pois_permitidos = MAPEAMENTO_ACESSO.get(area_usuario, [])
-            
-            # Área "geral" vê tudo
-            if "*" in pois_permitidos:
-                return True
-            
-            # Verifica match exato
-            if poi_real in pois_permitidos:
-                return True
-        
-        return False
-
     @staticmethod
     def _extrair_poi_real_do_evento(poi_amigavel: str) -> str:
         """
         Extrai o POI real baseado nos dados do SharePoint - COM DEBUG
         """
-        
-        # MAPEAMENTO: Nome amigável → POI real da coluna PontodeInteresse
-        MAPEAMENTO_POI_REAL = {
-            # P.A.
-            "p.a. água clara - rrp": "PA AGUA CLARA",
-            "p.a. agua clara - rrp": "PA AGUA CLARA",
-            "p.a. celulose - tls": "PA Celulose",
-            
-            # Carregamento/Fábrica
-            "carregamento fábrica - rrp": "Carregamento Fabrica RRP",
-            "carregamento fabrica - rrp": "Carregamento Fabrica RRP",
-            "carregamento fábrica - tls": "Carregamento Fabrica",
-            "carregamento fabrica - tls": "Carregamento Fabrica",
-            
-            # Terminal
-            "terminal inocência - rrp": "Descarga Inocencia",
-            "terminal inocencia - rrp": "Descarga Inocencia",
-            "terminal aparecida - tls": "Descarga TAP",
-            
-            # Manutenção
-            "manutenção - rrp": "Oficina JSL",
-            "manutencao - rrp": "Oficina JSL",
-            "manutenção - tls": "Manutencao TLS",
-            "manutencao - tls": "Manutencao TLS"
-        }
-        
         poi_normalizado = poi_amigavel.strip().lower()
-        poi_real = MAPEAMENTO_POI_REAL.get(poi_normalizado, poi_amigavel)
+        poi_real = LocationProcessor.MAPEAMENTO_POI_REAL.get(poi_normalizado, poi_amigavel)
                 
         return poi_real
 
@@ -391,38 +385,17 @@ class LocationProcessor:
         if not areas_usuario:
             return False
         
-        # MAPEAMENTO EXATO conforme especificado
-        MAPEAMENTO_ACESSO = {
-            "geral": ["*"],  # Vê todos
-            "pa agua clara rrp": ["PA AGUA CLARA"],
-            "terminal rrp": ["Descarga Inocencia"],
-            "fábrica rrp": ["Carregamento Fabrica RRP"],
-            "fabrica rrp": ["Carregamento Fabrica RRP"],
-            "manutenção rrp": ["Oficina JSL"],
-            "manutencao rrp": ["Oficina JSL"],
-            "fábrica tls": ["Carregamento Fabrica"],
-            "fabrica tls": ["Carregamento Fabrica"],
-            "pa celulose tls": ["PA Celulose"],
-            "terminal tls": ["Descarga TAP"]
-        }
+        # POIs liberados pelas áreas do usuário (normalização memoizada por conjunto de áreas)
+        pois_permitidos = _pois_permitidos_por_areas(tuple(areas_usuario))
         
-        # Normaliza áreas do usuário
-        areas_normalizadas = [area.strip().lower() for area in areas_usuario]
+        # Área "geral" vê tudo
+        if "*" in pois_permitidos:
+            return True
         
-        # Extrai POI real do evento
+        # Verifica match exato com o POI real do evento
         poi_real = LocationProcessor._extrair_poi_real_do_evento(poi_amigavel)
-        
-        # Verifica cada área do usuário
-        for area_usuario in areas_normalizadas:
-            pois_permitidos = MAPEAMENTO_ACESSO.get(area_usuario, [])
-            
-            # Área "geral" vê tudo
-            if "*" in pois_permitidos:
-                return True
-            
-            # Verifica match exato
-            if poi_real in pois_permitidos:
-                return True
+        if poi_real in pois_permitidos:
+            return True
         
         return False
         
@@ -147,7 +147,8 @@ class SharePointClient:
         Atualiza múltiplos itens em paralelo para melhor performance
         
         Args:
-            atualizacoes: Lista de tuplas (item_id, dados)
+            atualizacoes: Lista de tuplas (item_id, dados). O dict de dados pode ser
+                compartilhado entre vários itens e é tratado como somente leitura
             
         Returns:
             int: Número de itens atualizados com sucesso
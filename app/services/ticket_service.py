@@ -5,6 +5,7 @@ app/services/ticket_service.py - USA CAMPO 'Imagem' (Hiperlink-Imagem)
 import base64
 import json
 import hashlib
+import os
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
@@ -36,6 +37,44 @@ except ImportError:
     logger = logging.getLogger("ticket_service")
 
 
+# Limites padrão quando a configuração centralizada não está disponível
+_TAMANHO_MAXIMO_PADRAO = 10 * 1024 * 1024
+_EXTENSOES_PADRAO = frozenset((".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"))
+
+# MIME do data URL por extensão (demais extensões usam image/png)
+_MIME_POR_EXTENSAO = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+}
+
+# Assinaturas de cabeçalho -> formato (chaves com 2 ou 4 bytes; WEBP é tratado à parte)
+_ASSINATURAS_IMAGEM = {
+    b'\x89PNG': "png",
+    b'GIF8': "gif",
+    b'\xff\xd8': "jpeg",
+    b'BM': "bmp",
+}
+
+
+def _detectar_formato_imagem(conteudo: bytes) -> Optional[str]:
+    """
+    Identifica o formato da imagem pela assinatura do cabeçalho
+    
+    Args:
+        conteudo: Bytes do arquivo (apenas o início é examinado)
+        
+    Returns:
+        "jpeg", "png", "gif", "bmp", "webp" ou None se não reconhecido
+    """
+    formato = _ASSINATURAS_IMAGEM.get(conteudo[:4]) or _ASSINATURAS_IMAGEM.get(conteudo[:2])
+    if formato:
+        return formato
+    if conteudo[:4] == b'RIFF' and conteudo[8:12] == b'WEBP':
+        return "webp"
+    return None
+
+
 class TicketService:
     """Serviço FINAL para tickets - USA CAMPO 'Imagem' (Hiperlink-Imagem)"""
     
@@ -121,6 +160,43 @@ class TicketService:
             logger.error(f"❌ Erro ao criar ticket: {str(e)}")
             return False, f"Erro: {str(e)}", None
     
+    def validar_imagem(self, file_content: bytes, filename: str) -> Tuple[bool, str]:
+        """
+        Valida imagem anexada ao ticket (tamanho, extensão e assinatura)
+        
+        O cabeçalho é classificado uma única vez a partir dos bytes já
+        carregados - o arquivo não é reaberto.
+        
+        Args:
+            file_content: Conteúdo do arquivo
+            filename: Nome original do arquivo
+            
+        Returns:
+            Tupla (valido, mensagem)
+        """
+        if not file_content:
+            return False, "Arquivo vazio"
+        
+        if CONFIG_AVAILABLE and file_upload_config:
+            tamanho_maximo = file_upload_config.max_file_size_bytes
+            extensoes_permitidas = file_upload_config.allowed_extensions
+        else:
+            tamanho_maximo = _TAMANHO_MAXIMO_PADRAO
+            extensoes_permitidas = _EXTENSOES_PADRAO
+        
+        if len(file_content) > tamanho_maximo:
+            return False, f"Arquivo muito grande (máximo {tamanho_maximo // (1024 * 1024)}MB)"
+        
+        extensao = os.path.splitext(filename or "")[1].lower()
+        if extensao not in extensoes_permitidas:
+            return False, f"Extensão não permitida: {extensao or 'sem extensão'}"
+        
+        formato = _detectar_formato_imagem(file_content)
+        if formato is None:
+            return False, "Arquivo não é uma imagem válida"
+        
+        return True, f"Imagem {formato.upper()} válida"
+    
     def _processar_upload_imagem(self, ctx, ticket_id: int, 
                                file_content: bytes, filename: str) -> Tuple[bool, str]:
         """Upload para CAMPO IMAGEM (Hiperlink-Imagem)"""
@@ -195,19 +271,12 @@ class TicketService:
         try:
             logger.info("💾 Estratégia 2: Base64 para campo Imagem...")
             
-            # Base64
-            base64_content = base64.b64encode(file_content).decode('utf-8')
-            
             # MIME type
-            if filename.lower().endswith('.png'):
-                mime_type = 'image/png'
-            elif filename.lower().endswith(('.jpg', '.jpeg')):
-                mime_type = 'image/jpeg'
-            else:
-                mime_type = 'image/png'
+            extensao = os.path.splitext(filename)[1].lower()
+            mime_type = _MIME_POR_EXTENSAO.get(extensao, 'image/png')
             
-            # Data URL
-            data_url = f"data:{mime_type};base64,{base64_content}"
+            # Data URL (base64 é ASCII puro; intermediário não fica referenciado)
+            data_url = f"data:{mime_type};base64," + base64.b64encode(file_content).decode('ascii')
             
             # Salva no campo Imagem
             tickets_list = ctx.web.lists.get_by_title(self.lista_tickets)
@@ -273,9 +342,7 @@ class TicketService:
                                 
                                 # Valida se é uma imagem válida
                                 if len(real_content) > 100 and (
-                                    real_content.startswith(b'\xff\xd8') or  # JPEG
-                                    real_content.startswith(b'\x89PNG') or   # PNG
-                                    real_content.startswith(b'GIF8')         # GIF
+                                    _detectar_formato_imagem(real_content) in ("jpeg", "png", "gif")
                                 ):
                                     logger.info("✅ Imagem válida detectada!")
                                     return real_content
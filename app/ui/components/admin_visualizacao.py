@@ -9,6 +9,8 @@ from ...core.session_state import get_session_state
 from ...services.evento_processor import EventoProcessor
 from ...services.sharepoint_client import SharePointClient
 from ...utils.ui_utils import get_screen_size, mostrar_mensagem
+from ...config.logging_config import setup_logger
+logger = setup_logger("admin_visualizacao")
 
 
 class AdminVisualizacao:
@@ -128,6 +130,8 @@ class AdminVisualizacao:
                 # Debug: mostra contagem por status
                 if "Status" in self.df_todos_dados.columns:
                     contagem_status = self.df_todos_dados["Status"].value_counts()
+                    # Status da sessão é categórico: omite categorias sem registros
+                    contagem_status = contagem_status[contagem_status > 0]
                     print("\n📊 Contagem por status (DADOS SESSÃO):")
                     for status, count in contagem_status.items():
                         print(f"   {status}: {count}")
@@ -428,25 +432,25 @@ class AdminVisualizacao:
         
         if titulo and titulo.strip():
             try:
-                print(f"🔍 Debug: Processando título: {titulo[:50]}...")
+                logger.debug(f"🔍 Debug: Processando título: {titulo[:50]}...")
                 evento_info = EventoProcessor.parse_titulo_completo(titulo)
                 
                 if evento_info and evento_info.get("valido", False):
                     data_fmt = evento_info.get("datahora_fmt", "N/A")
                     tipo = evento_info.get("tipo_amigavel", "N/A")
                     poi = evento_info.get("poi_amigavel", "N/A")
-                    print(f"✅ Processado: {data_fmt} | {tipo} | {poi}")
+                    logger.debug(f"✅ Processado: {data_fmt} | {tipo} | {poi}")
                 else:
-                    print(f"⚠️ Evento inválido ou não reconhecido")
+                    logger.debug(f"⚠️ Evento inválido ou não reconhecido")
                     # Tenta extrair informações básicas do título
                     data_fmt, tipo, poi = self._extrair_info_basica_titulo(titulo)
                     
             except Exception as e:
-                print(f"❌ Erro ao processar título: {e}")
+                logger.warning(f"❌ Erro ao processar título: {e}")
                 # Fallback: extração manual básica
                 data_fmt, tipo, poi = self._extrair_info_basica_titulo(titulo)
         else:
-            print(f"⚠️ Título vazio ou inválido")
+            logger.debug(f"⚠️ Título vazio ou inválido")
         
         # Se ainda está N/A, tenta usar outras colunas do registro
         if data_fmt == "N/A":
@@ -520,7 +524,7 @@ class AdminVisualizacao:
         data_fmt = tipo = poi = "N/A"
         
         try:
-            print(f"🔧 Processando título: {titulo}")
+            logger.debug(f"🔧 Processando título: {titulo}")
             
             # PADRÃO: RRP_CarrregamentoFabricaRRP_N1_21072025_16000
             # FORMATO: UNIDADE_LOCAL_TIPO_DDMMAAAA_HHMM[SS]
@@ -543,7 +547,7 @@ class AdminVisualizacao:
                     minuto = "00"
                 
                 data_fmt = f"{dia}/{mes} {hora}:{minuto}"
-                print(f"✅ Data extraída: {data_fmt}")
+                logger.debug(f"✅ Data extraída: {data_fmt}")
             
             # 2. EXTRAI TIPO (N1, N2, N3, N4, Informativo)
             if "_N1_" in titulo:
@@ -565,7 +569,7 @@ class AdminVisualizacao:
                 else:
                     tipo = "Tipo não identificado"
             
-            print(f"✅ Tipo extraído: {tipo}")
+            logger.debug(f"✅ Tipo extraído: {tipo}")
             
             # 3. EXTRAI UNIDADE E LOCAL (POI)
             # Divide o título em partes
@@ -602,21 +606,21 @@ class AdminVisualizacao:
                 else:
                     poi = f"{unidade} - {local_raw}"
             
-            print(f"✅ POI extraído: {poi}")
+            logger.debug(f"✅ POI extraído: {poi}")
             
             # EXEMPLO DE PROCESSAMENTO COMPLETO:
             # Título: RRP_CarrregamentoFabricaRRP_N1_21072025_16000
             # Resultado: 21/07 16:00 | Tratativa N1 | Carregamento Fábrica - RRP
             
         except Exception as e:
-            print(f"❌ Erro na extração do título: {e}")
+            logger.warning(f"❌ Erro na extração do título: {e}")
             # Fallback básico
             if "RRP" in titulo:
                 poi = "Ribas do Rio Pardo"
             elif "TLS" in titulo:
                 poi = "Três Lagoas"
         
-        print(f"🎯 Resultado final: {data_fmt} | {tipo} | {poi}")
+        logger.debug(f"🎯 Resultado final: {data_fmt} | {tipo} | {poi}")
         return data_fmt, tipo, poi
     
     def _extrair_data_alternativa(self, row):
@@ -3,10 +3,12 @@ Componente de cards do dashboard
 """
 import flet as ft
 import pandas as pd
+from datetime import datetime
 from ...core.session_state import get_session_state
 from ...services.evento_processor import EventoProcessor
 from ...services.data_formatter import DataFormatter
 from ...utils.ui_utils import get_screen_size
+from ...config.timezone_config import TZ_BRASILIA
 
 
 class DashboardCards:
@@ -278,22 +280,16 @@ class DashboardCards:
         
         # Se não é aprovador nem torre, filtrar por área
         if perfil not in ("aprovador", "torre"):
-            df_filtrado = pd.DataFrame()
-            
-            for _, row in df_nao_aprovados.iterrows():
-                evento_titulo = row.get("Titulo", "")
-                if evento_titulo:
-                    try:
-                        evento_info = EventoProcessor.parse_titulo_completo(evento_titulo)
-                        poi_amigavel = evento_info["poi_amigavel"]
-                        
-                        # VERIFICAÇÃO DE ACESSO POR POI
-                        if EventoProcessor.validar_acesso_usuario(poi_amigavel, areas):
-                            df_filtrado = pd.concat([df_filtrado, row.to_frame().T], ignore_index=True)
-                    except Exception:
-                        continue
+            # Parse e verificação de acesso em lote (uma vez por título/POI distinto)
+            titulos = df_nao_aprovados.get("Titulo", pd.Series("", index=df_nao_aprovados.index))
+            com_titulo = titulos.map(bool)
+            pois = EventoProcessor.parse_titulo_completo_batch(titulos[com_titulo]).get(
+                "poi_amigavel", pd.Series(dtype=object)
+            )
             
-            return df_filtrado
+            # VERIFICAÇÃO DE ACESSO POR POI
+            tem_acesso = EventoProcessor.validar_acesso_usuario_many(pois, areas)
+            return df_nao_aprovados[com_titulo][tem_acesso].reset_index(drop=True)
         
         return df_nao_aprovados
     
@@ -329,9 +325,10 @@ class DashboardCards:
             return 0
         
         tempos = []
+        agora = datetime.now(TZ_BRASILIA)
         for _, row in df_tipo.iterrows():
             data_entrada_str = row.get("Data/Hora Entrada", "")
-            tempo_info = EventoProcessor.calcular_tempo_decorrido(data_entrada_str)
+            tempo_info = EventoProcessor.calcular_tempo_decorrido(data_entrada_str, agora)
             if tempo_info["data_entrada_valida"]:
                 tempos.append(tempo_info["horas"])
         
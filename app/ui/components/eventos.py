@@ -195,22 +195,16 @@ class EventosManager:
         
         # Se não é aprovador nem torre, filtrar por área
         if perfil not in ("aprovador", "torre"):
-            df_filtrado = pd.DataFrame()
-            
-            for _, row in df_nao_aprovados.iterrows():
-                evento_titulo = row.get("Titulo", "")
-                if evento_titulo:
-                    try:
-                        evento_info = EventoProcessor.parse_titulo_completo(evento_titulo)
-                        poi_amigavel = evento_info["poi_amigavel"]
-                        
-                        # VERIFICAÇÃO DE ACESSO POR EVENTO
-                        if EventoProcessor.validar_acesso_usuario(poi_amigavel, areas):
-                            df_filtrado = pd.concat([df_filtrado, row.to_frame().T], ignore_index=True)
-                    except Exception:
-                        continue
+            # Parse e verificação de acesso em lote (uma vez por título/POI distinto)
+            titulos = df_nao_aprovados.get("Titulo", pd.Series("", index=df_nao_aprovados.index))
+            com_titulo = titulos.map(bool)
+            pois = EventoProcessor.parse_titulo_completo_batch(titulos[com_titulo]).get(
+                "poi_amigavel", pd.Series(dtype=object)
+            )
             
-            return df_filtrado
+            # VERIFICAÇÃO DE ACESSO POR EVENTO
+            tem_acesso = EventoProcessor.validar_acesso_usuario_many(pois, areas)
+            return df_nao_aprovados[com_titulo][tem_acesso].reset_index(drop=True)
 
         return df_nao_aprovados
     
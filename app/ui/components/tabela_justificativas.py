@@ -10,6 +10,7 @@ from ...services.data_formatter import DataFormatter
 from ...services.sharepoint_client import SharePointClient
 from ...services.audit_service import audit_service
 from ...utils.ui_utils import get_screen_size, mostrar_mensagem
+from ...config.timezone_config import TZ_BRASILIA
 
 # NOVO: Importa validadores centralizados
 from ...validators import field_validator, business_validator
@@ -121,8 +122,8 @@ class TabelaJustificativas:
                 df_evento[col] = ""
         
         df_exibir = df_evento[colunas_necessarias].copy()
-        df_exibir["Data/Hora Entrada"] = df_exibir["Data/Hora Entrada"].apply(DataFormatter.formatar_data_exibicao)
-        df_exibir["Previsao_Liberacao"] = df_exibir["Previsao_Liberacao"].apply(DataFormatter.formatar_data_exibicao)
+        df_exibir["Data/Hora Entrada"] = DataFormatter.formatar_datas_exibicao(df_exibir["Data/Hora Entrada"])
+        df_exibir["Previsao_Liberacao"] = DataFormatter.formatar_datas_exibicao(df_exibir["Previsao_Liberacao"])
         
         return df_exibir
     
@@ -348,9 +349,8 @@ class TabelaJustificativas:
             return opcoes
         
         from datetime import datetime, timedelta
-        import pytz
         
-        agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+        agora = datetime.now(TZ_BRASILIA)
         data_hoje = agora.strftime("%d/%m/%Y")
         
         hora_padrao = agora + timedelta(hours=1)
@@ -424,7 +424,7 @@ class TabelaJustificativas:
             self.page.update()
         
         def usar_hoje_mais_uma_hora(e):
-            agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+            agora = datetime.now(TZ_BRASILIA)
             data_hoje = agora.strftime("%d/%m/%Y")
             hora_mais_uma = agora + timedelta(hours=1)
             minutos = hora_mais_uma.minute
@@ -441,7 +441,7 @@ class TabelaJustificativas:
             self.page.update()
         
         def usar_amanha_mesmo_horario(e):
-            agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+            agora = datetime.now(TZ_BRASILIA)
             amanha = agora + timedelta(days=1)
             data_amanha = amanha.strftime("%d/%m/%Y")
             
@@ -695,8 +695,8 @@ class TabelaJustificativas:
                     status_evento = EventoProcessor.calcular_status_evento(df_evento, session.alteracoes_pendentes)
                     
                     atualizacoes_status = []
-                    for _, row in df_evento.iterrows():
-                        row_id = str(row["ID"]).strip()
+                    for item_id in df_evento["ID"]:
+                        row_id = str(item_id).strip()
                         dados_status = {"Status": status_evento}
                         atualizacoes_status.append((int(row_id), dados_status))
                     
@@ -2,6 +2,7 @@
 Modal para abertura de tickets de suporte - INTERFACE COMPLETA CORRIGIDA
 app/ui/components/ticket_modal.py
 """
+import hashlib
 import flet as ft
 from typing import Optional, Callable
 
@@ -317,30 +318,13 @@ class TicketModal:
                 try:
                     logger.info("🌐 Tentando upload server-side...")
                     
-                    # Cria um upload temporário
-                    upload_dir = "temp_uploads"
-                    import os
-                    if not os.path.exists(upload_dir):
-                        os.makedirs(upload_dir)
-                    
-                    # Define caminho temporário
-                    import uuid
-                    temp_filename = f"{uuid.uuid4()}_{file.name}"
-                    temp_path = os.path.join(upload_dir, temp_filename)
-                    
-                    # Para Flet Web, o arquivo já pode estar acessível via file.path
-                    if file.path and os.path.exists(file.path):
-                        logger.info(f"📂 Copiando de {file.path}")
-                        import shutil
-                        shutil.copy2(file.path, temp_path)
-                        
-                        # Lê o arquivo copiado
-                        with open(temp_path, 'rb') as f:
+                    # Para Flet Web, o arquivo já pode estar acessível via file.path:
+                    # lê direto do caminho (um único open, sem cópia temporária)
+                    if file.path:
+                        logger.info(f"📂 Lendo de {file.path}")
+                        with open(file.path, 'rb') as f:
                             self.imagem_content = f.read()
                         
-                        # Remove arquivo temporário
-                        os.remove(temp_path)
-                        
                         logger.info(f"✅ Upload server-side: {len(self.imagem_content)} bytes")
                         self._processar_imagem_carregada()
                         return
@@ -422,7 +406,6 @@ class TicketModal:
         """Modo compatibilidade - registra arquivo sem conteúdo binário"""
         try:
             # Gera uma "assinatura" da imagem baseada nos metadados
-            import hashlib
             info_arquivo = f"{file.name}_{file.size}_{getattr(file, 'last_modified', 'unknown')}"
             assinatura = hashlib.md5(info_arquivo.encode()).hexdigest()[:16]
             
@@ -390,16 +390,11 @@ class AdminVisualizacaoMelhorada:
             "Motivo", "Observacao"
         ]
         
-        # Adiciona colunas processadas
-        df_export["Data_Evento"] = df_export["Titulo"].apply(
-            lambda x: EventoProcessor.parse_titulo_completo(x).get("datahora_fmt", "")
-        )
-        df_export["Tipo_Evento"] = df_export["Titulo"].apply(
-            lambda x: EventoProcessor.parse_titulo_completo(x).get("tipo_amigavel", "")
-        )
-        df_export["POI_Amigavel"] = df_export["Titulo"].apply(
-            lambda x: EventoProcessor.parse_titulo_completo(x).get("poi_amigavel", "")
-        )
+        # Adiciona colunas processadas (um único parse por título distinto)
+        df_titulos = EventoProcessor.parse_titulo_completo_batch(df_export["Titulo"])
+        df_export["Data_Evento"] = df_titulos.get("datahora_fmt", "")
+        df_export["Tipo_Evento"] = df_titulos.get("tipo_amigavel", "")
+        df_export["POI_Amigavel"] = df_titulos.get("poi_amigavel", "")
         
         # Colunas detalhadas (opcionais)
         if incluir_detalhes:
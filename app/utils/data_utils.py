@@ -2,14 +2,17 @@
 Utilitários para processamento de dados - MIGRADO PARA VALIDAÇÕES CENTRALIZADAS
 """
 import pandas as pd
-import pytz
 import re
 from datetime import datetime
 from ..services.data_formatter import DataFormatter
+from ..config.timezone_config import TZ_BRASILIA
 
 # 🚀 NOVA IMPORTAÇÃO - Usa sistema centralizado para validações de auditoria
 from ..validators import business_validator
 
+# Status possíveis de um desvio (inclui "Não Tratado", atribuído pela verificação automática)
+STATUS_CONHECIDOS = ["Pendente", "Preenchido", "Aprovado", "Reprovado", "Não Tratado"]
+
 
 class DataUtils:
     """Utilitários para processamento e manipulação de dados com validações centralizadas"""
@@ -20,6 +23,9 @@ class DataUtils:
         if df.empty:
             return df
 
+        # O DataFrame pode vir direto do cache (objeto compartilhado): copia antes de alterar
+        df = df.copy()
+
         # Normaliza tipos de alerta
         if "Tipo_Alerta" in df.columns:
             df["Tipo_Alerta"] = df["Tipo_Alerta"].str.strip().str.lower().replace({
@@ -37,7 +43,7 @@ class DataUtils:
         if "Previsao_Liberacao" in df.columns:
             df["Previsao_Liberacao"] = pd.to_datetime(df["Previsao_Liberacao"], errors="coerce", utc=True)
             try:
-                df["Previsao_Liberacao"] = df["Previsao_Liberacao"].dt.tz_convert("America/Campo_Grande")
+                df["Previsao_Liberacao"] = df["Previsao_Liberacao"].dt.tz_convert(TZ_BRASILIA)
             except:
                 pass
 
@@ -47,7 +53,7 @@ class DataUtils:
             if coluna in df.columns:
                 df[coluna] = pd.to_datetime(df[coluna], errors="coerce", utc=True)
                 try:
-                    df[coluna] = df[coluna].dt.tz_convert("America/Campo_Grande")
+                    df[coluna] = df[coluna].dt.tz_convert(TZ_BRASILIA)
                 except:
                     pass
 
@@ -75,6 +81,10 @@ class DataUtils:
                 else:
                     df[col] = ""
 
+        # Status como categoria: comparações e isin operam sobre códigos inteiros
+        status_extras = [st for st in df["Status"].dropna().astype(str).unique() if st not in STATUS_CONHECIDOS]
+        df["Status"] = pd.Categorical(df["Status"], categories=STATUS_CONHECIDOS + status_extras)
+
         # NOVO: Executa verificação automática de status "Não Tratado"
         try:
             from ..services.auto_status_service import executar_verificacao_automatica
@@ -16,11 +16,14 @@ class ValidationError(Exception):
         super().__init__(message)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """
     Resultado padronizado de validação
     
+    Usa __slots__: cada validação aloca um resultado, então a instância
+    sem __dict__ é mais leve e tem acesso a atributos mais rápido.
+    
     Attributes:
         valid: Se a validação passou
         errors: Lista de mensagens de erro
@@ -41,6 +44,12 @@ class ValidationResult:
         if code:
             self.data[f"error_code_{len(self.errors)}"] = code
     
+    def add_errors(self, messages: List[str]):
+        """Adiciona várias mensagens de erro (sem código) de uma vez"""
+        if messages:
+            self.errors.extend(messages)
+            self.valid = False
+    
     def add_warning(self, message: str, code: str = None):
         """Adiciona uma mensagem de aviso"""
         self.warnings.append(message)
@@ -136,6 +145,8 @@ class BaseValidator(ABC):
         """Converte valor para string de forma segura"""
         if value is None:
             return ""
+        if type(value) is str:
+            return value.strip()
         return str(value).strip()
     
     def _ensure_not_empty(self, value: str, field_name: str = "Campo") -> ValidationResult:
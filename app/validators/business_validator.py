@@ -2,12 +2,37 @@
 Validador de regras de negócio específicas do Sistema Sentinela - Suzano
 Centraliza todas as validações relacionadas às regras de negócio logístico
 """
+import re
 import pandas as pd
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base import BaseValidator, ValidationResult, ValidationMessages, ValidationType
-from .field_validator import FieldValidator
+from .field_validator import FieldValidator, parse_data_hora_br
+
+# Valores (em minúsculas) tratados como campo não preenchido
+_VALORES_VAZIOS = frozenset(("", "none", "— selecione —"))
+
+
+def _compilar_palavras(*palavras: str) -> re.Pattern:
+    """Compila palavras-chave em uma única alternância (busca por substring em C)"""
+    return re.compile("|".join(map(re.escape, palavras)))
+
+
+# Palavras-chave (busca por substring) da validação rigorosa de acesso por área
+_RE_FABRICA = _compilar_palavras("fábrica", "fabrica", "carregamento")
+_RE_TERMINAL = _compilar_palavras("terminal", "inocência", "inocencia", "descarga")
+_RE_AREA_TERMINAL = _compilar_palavras("terminal", "inocência", "inocencia")
+_RE_AREA_PA = _compilar_palavras("p.a.", "agua clara", "água clara", "pa ")
+_RE_POI_PA = _compilar_palavras("agua clara", "p.a.", "pa ")
+_RE_OFICINA = _compilar_palavras("oficina", "manutenção", "manutencao")
+_AREAS_GERAIS = frozenset(("geral", "all", "todos", "todas"))
+
+
+def _normalizar_valor(valor: Any) -> str:
+    """Converte valor em string limpa, tratando None/placeholders como vazio"""
+    texto = valor.strip() if type(valor) is str else str(valor).strip()
+    return "" if texto.lower() in _VALORES_VAZIOS else texto
 
 
 class BusinessValidator(BaseValidator):
@@ -86,9 +111,10 @@ class BusinessValidator(BaseValidator):
         observacao_obrigatoria = motivo_normalizado in self.motivos_que_exigem_observacao
         result.add_data('observacao_obrigatoria', observacao_obrigatoria)
         
-        # Se obrigatória e não preenchida, erro
-        if observacao_obrigatoria and not observacao_normalizada:
-            result.add_error(ValidationMessages.OBSERVACAO_OBRIGATORIA)
+        # A regra em si fica em verificar_motivo_observacao
+        valido, erro = self.verificar_motivo_observacao(motivo, observacao)
+        if not valido:
+            result.add_error(erro)
         
         # Dados úteis para UI
         result.add_data('motivo_normalizado', motivo_normalizado)
@@ -124,12 +150,12 @@ class BusinessValidator(BaseValidator):
         if data_entrada and previsao_result.valid:
             try:
                 if ' ' in previsao:
-                    dt_previsao = datetime.strptime(previsao, "%d/%m/%Y %H:%M")
+                    dt_previsao = parse_data_hora_br(previsao)
                 else:
                     dt_previsao = datetime.strptime(previsao, "%d/%m/%Y")
                 
                 if ' ' in data_entrada:
-                    dt_entrada = datetime.strptime(data_entrada, "%d/%m/%Y %H:%M")
+                    dt_entrada = parse_data_hora_br(data_entrada)
                 else:
                     dt_entrada = datetime.strptime(data_entrada, "%d/%m/%Y")
                 
@@ -153,45 +179,55 @@ class BusinessValidator(BaseValidator):
         df_evento = data.get('df_evento')
         alteracoes_pendentes = data.get('alteracoes_pendentes', {})
         titulo_evento = data.get('titulo_evento', '')
+        # Alterações já particionadas por evento (validação em lote), indexadas pelo ID
+        alteracoes_evento = data.get('alteracoes_evento')
         
         if df_evento is None or df_evento.empty:
             result.add_error("DataFrame do evento não pode estar vazio")
             return
         
-        erros_registros = []
-        
-        # Valida cada registro do evento
-        for _, row in df_evento.iterrows():
-            row_id = str(row["ID"]).strip()
-            chave_alteracao = f"{titulo_evento}_{row_id}"
-            placa = str(row.get("Placa", ""))
-            
-            # Obtém valores atuais (com alterações pendentes aplicadas)
-            motivo_atual = self._get_valor_com_alteracoes(
-                row, "Motivo", alteracoes_pendentes, chave_alteracao
-            )
-            obs_atual = self._get_valor_com_alteracoes(
-                row, "Observacoes", alteracoes_pendentes, chave_alteracao
+        # Alterações deste evento indexadas pelo ID puro: uma varredura do dict global
+        # em vez de montar a chave "{titulo}_{ID}" para cada linha
+        if alteracoes_evento is None:
+            prefixo = f"{titulo_evento}_"
+            tamanho_prefixo = len(prefixo)
+            alteracoes_evento = {
+                chave[tamanho_prefixo:]: alteracao
+                for chave, alteracao in alteracoes_pendentes.items()
+                if chave.startswith(prefixo)
+            }
+        ids_registro = df_evento["ID"].map(str).str.strip() if alteracoes_evento else None
+        
+        # Atalho: sem coluna Motivo e sem alterações pendentes não há motivo 'Outros'
+        if "Motivo" not in df_evento.columns and not alteracoes_evento:
+            mask_erro = pd.Series(False, index=df_evento.index)
+        else:
+            # Obtém valores atuais (com alterações pendentes aplicadas) coluna a coluna
+            motivo_atual = self._get_coluna_com_alteracoes(
+                df_evento, "Motivo", alteracoes_evento, ids_registro
             )
             
-            # 🚀 CORREÇÃO: Valida motivo + observação de forma mais simples
-            try:
-                # Usa validação interna direta para evitar recursão
-                motivo_normalizado = str(motivo_atual).strip().lower() if motivo_atual else ""
-                obs_normalizada = str(obs_atual).strip() if obs_atual else ""
-                
-                # Verifica regra específica
-                if motivo_normalizado == "outros" and not obs_normalizada:
-                    erros_registros.append(f"• Placa {placa}: Observação é obrigatória quando motivo é 'Outros'")
-                    
-            except Exception as e:
-                # Log do erro mas não para a validação
-                print(f"⚠️ Erro na validação do registro {placa}: {str(e)}")
-                erros_registros.append(f"• Placa {placa}: Erro na validação - verifique os dados")
-        
-        # Adiciona todos os erros encontrados
-        for erro in erros_registros:
-            result.add_error(erro)
+            # Regra motivo 'Outros' exige observação, avaliada como máscara booleana;
+            # Observacoes só é processada se algum registro tiver motivo 'Outros'
+            mask_erro = motivo_atual.str.lower().eq("outros")
+            if mask_erro.any():
+                obs_atual = self._get_coluna_com_alteracoes(
+                    df_evento, "Observacoes", alteracoes_evento, ids_registro
+                )
+                mask_erro &= obs_atual.eq("")
+        
+        placas = (
+            df_evento.loc[mask_erro, "Placa"].tolist()
+            if "Placa" in df_evento.columns
+            else [""] * int(mask_erro.sum())
+        )
+        erros_registros = [
+            f"• Placa {placa}: Observação é obrigatória quando motivo é 'Outros'"
+            for placa in placas
+        ]
+        
+        # Adiciona todos os erros encontrados de uma vez
+        result.add_errors(erros_registros)
         
         # Dados úteis
         result.add_data('total_registros', len(df_evento))
@@ -222,6 +258,10 @@ class BusinessValidator(BaseValidator):
         
         poi_lower = poi_amigavel.lower()
         
+        # Classificação do POI calculada uma vez (não depende da área)
+        poi_fabrica = _RE_FABRICA.search(poi_lower) is not None
+        poi_terminal = _RE_TERMINAL.search(poi_lower) is not None
+        
         for area in areas_usuario:
             area_normalizada = area.strip().lower()
             
@@ -229,32 +269,26 @@ class BusinessValidator(BaseValidator):
             
             # FÁBRICA - só acessa fábrica, não terminal
             if "fábrica" in area_normalizada or "fabrica" in area_normalizada:
-                is_fabrica = any(palavra in poi_lower for palavra in ["fábrica", "fabrica", "carregamento"])
-                not_terminal = not any(palavra in poi_lower for palavra in ["terminal", "inocência", "inocencia", "descarga"])
-                if is_fabrica and not_terminal:
+                if poi_fabrica and not poi_terminal:
                     return True
             
             # TERMINAL - só acessa terminal, não fábrica  
-            elif "terminal" in area_normalizada or "inocência" in area_normalizada or "inocencia" in area_normalizada:
-                is_terminal = any(palavra in poi_lower for palavra in ["terminal", "inocência", "inocencia", "descarga"])
-                not_fabrica = not any(palavra in poi_lower for palavra in ["fábrica", "fabrica", "carregamento"])
-                if is_terminal and not_fabrica:
+            elif _RE_AREA_TERMINAL.search(area_normalizada):
+                if poi_terminal and not poi_fabrica:
                     return True
             
             # P.A. - só acessa P.A.
-            elif any(palavra in area_normalizada for palavra in ["p.a.", "agua clara", "água clara", "pa "]):
-                is_pa = any(palavra in poi_lower for palavra in ["agua clara", "p.a.", "pa "])
-                if is_pa:
+            elif _RE_AREA_PA.search(area_normalizada):
+                if _RE_POI_PA.search(poi_lower):
                     return True
             
             # OFICINA/MANUTENÇÃO - só acessa oficina
-            elif any(palavra in area_normalizada for palavra in ["oficina", "manutenção", "manutencao"]):
-                is_oficina = any(palavra in poi_lower for palavra in ["oficina", "manutenção", "manutencao"])
-                if is_oficina:
+            elif _RE_OFICINA.search(area_normalizada):
+                if _RE_OFICINA.search(poi_lower):
                     return True
             
             # ÁREAS ESPECIAIS
-            elif area_normalizada in ["geral", "all", "todos", "todas"]:
+            elif area_normalizada in _AREAS_GERAIS:
                 return True
         
         return False
@@ -335,35 +369,39 @@ class BusinessValidator(BaseValidator):
     
     # =================== MÉTODOS UTILITÁRIOS ===================
     
-    def _get_valor_com_alteracoes(self, row: pd.Series, campo: str, 
-                                 alteracoes: Dict, chave_alteracao: str) -> str:
+    def _get_coluna_com_alteracoes(self, df: pd.DataFrame, campo: str,
+                                   alteracoes: Dict, ids_registro: pd.Series) -> pd.Series:
         """
-        Obtém valor atual do campo considerando alterações pendentes
+        Obtém valores atuais de uma coluna considerando alterações pendentes
         
         Args:
-            row: Linha do DataFrame
+            df: DataFrame do evento
             campo: Nome do campo
-            alteracoes: Dicionário de alterações pendentes
-            chave_alteracao: Chave específica das alterações
+            alteracoes: Alterações pendentes do evento, indexadas pelo ID do registro
+            ids_registro: ID (string) de cada linha (mesmo índice de df)
             
         Returns:
-            str: Valor atual (original ou alterado)
+            pd.Series: Valores atuais normalizados (original ou alterado)
         """
-        # Valor original do DataFrame
-        valor_original = str(row.get(campo, "")).strip()
-        
-        # Normaliza valores especiais
-        if valor_original.lower() in ("none", "— selecione —"):
-            valor_original = ""
-        
-        # Verifica se há alteração pendente
-        if chave_alteracao in alteracoes and campo in alteracoes[chave_alteracao]:
-            valor_alteracao = str(alteracoes[chave_alteracao][campo]).strip()
-            if valor_alteracao.lower() in ("none", "— selecione —"):
-                return ""
-            return valor_alteracao
-        
-        return valor_original
+        # Valor original do DataFrame (normalizado em lote)
+        if campo in df.columns:
+            valores = df[campo].map(str).str.strip()
+            valores = valores.mask(valores.str.lower().isin(_VALORES_VAZIOS), "")
+        else:
+            valores = pd.Series("", index=df.index)
+        
+        # Sobrepõe alterações pendentes em uma única passada
+        if alteracoes:
+            normalizar = _normalizar_valor
+            pendentes = {
+                chave: normalizar(alteracao[campo])
+                for chave, alteracao in alteracoes.items()
+                if campo in alteracao
+            }
+            if pendentes:
+                valores = ids_registro.map(pendentes).combine_first(valores)
+        
+        return valores
     
     # =================== MÉTODOS PÚBLICOS ESPECÍFICOS ===================
     
@@ -376,6 +414,18 @@ class BusinessValidator(BaseValidator):
         data = {'motivo': motivo, 'observacao': observacao}
         return self.validate_rule('motivo_observacao', data)
     
+    def verificar_motivo_observacao(self, motivo: str, observacao: str) -> Tuple[bool, str]:
+        """
+        Caminho rápido da regra motivo + observação, sem montar ValidationResult
+        
+        Returns:
+            Tuple[bool, str]: (válido, mensagem de erro ou "")
+        """
+        if (self._ensure_string(motivo).lower() in self.motivos_que_exigem_observacao
+                and not self._ensure_string(observacao)):
+            return False, ValidationMessages.OBSERVACAO_OBRIGATORIA
+        return True, ""
+    
     def validate_previsao_posterior(self, previsao: str, data_entrada: str, 
                                   must_be_future: bool = False) -> ValidationResult:
         """Método público para validar previsão posterior à entrada"""
@@ -397,6 +447,36 @@ class BusinessValidator(BaseValidator):
         }
         return self.validate_rule('evento_completo', data)
     
+    def validate_eventos_justificativas_lote(self, dfs_por_titulo: Dict[str, pd.DataFrame],
+                                             alteracoes_pendentes: Dict) -> Dict[str, ValidationResult]:
+        """
+        Valida justificativas de vários eventos de uma vez
+        
+        As alterações pendentes são particionadas por título uma única vez
+        (chave "{titulo}_{ID}", com ID sem "_"), em vez de varrer o dict
+        global para cada evento.
+        
+        Args:
+            dfs_por_titulo: Dict {titulo_evento: DataFrame do evento}
+            alteracoes_pendentes: Alterações pendentes de todos os eventos
+            
+        Returns:
+            Dict[str, ValidationResult]: Resultado por título
+        """
+        alteracoes_por_titulo: Dict[str, Dict] = {}
+        for chave, alteracao in alteracoes_pendentes.items():
+            titulo, _, row_id = chave.rpartition("_")
+            alteracoes_por_titulo.setdefault(titulo, {})[row_id] = alteracao
+        
+        return {
+            titulo: self.validate_rule('evento_completo', {
+                'df_evento': df_evento,
+                'alteracoes_evento': alteracoes_por_titulo.get(titulo, {}),
+                'titulo_evento': titulo
+            })
+            for titulo, df_evento in dfs_por_titulo.items()
+        }
+    
     def validate_acesso_usuario_poi(self, poi_amigavel: str, areas_usuario: List[str], 
                                    localizacao: str = "RRP") -> ValidationResult:
         """Método público para validar acesso do usuário ao POI"""
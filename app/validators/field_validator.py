@@ -3,11 +3,70 @@ Validador de campos básicos
 Centraliza validações de campos de formulário e tipos de dados
 """
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, Optional
-import pandas as pd
 
 from .base import BaseValidator, ValidationResult, ValidationMessages, ValidationType
+from ..config.timezone_config import TZ_BRASILIA
+
+
+@lru_cache(maxsize=4096)
+def parse_data_hora_br(texto: str) -> datetime:
+    """
+    Parse de "dd/mm/aaaa HH:MM" por fatiamento de posições fixas (memoizado por texto)
+    
+    Helper público, compartilhado por FieldValidator, BusinessValidator e
+    EventoProcessor para datas no formato brasileiro.
+    
+    Formatos fora do padrão de 16 caracteres (ex: hora com um dígito) caem
+    no strptime, mantendo exatamente as mesmas regras de aceitação.
+    
+    Raises:
+        ValueError: Se o texto não representar uma data/hora válida
+    """
+    if (len(texto) == 16 and texto[2] == '/' and texto[5] == '/'
+            and texto[10] == ' ' and texto[13] == ':'):
+        digitos = texto[0:2] + texto[3:5] + texto[6:10] + texto[11:13] + texto[14:16]
+        if digitos.isascii() and digitos.isdigit():
+            return datetime(
+                int(texto[6:10]), int(texto[3:5]), int(texto[0:2]),
+                int(texto[11:13]), int(texto[14:16])
+            )
+    
+    return datetime.strptime(texto, "%d/%m/%Y %H:%M")
+
+
+def parse_data_hora_titulo(data_str: str, hora_str: str) -> Optional[datetime]:
+    """
+    Parse da data/hora embutida no título do evento ("ddmmaaaa", "HHMMSS")
+    
+    Helper público, usado por EventoProcessor e LocationProcessor.
+    
+    Títulos malformados são descartados por verificação explícita, sem
+    passar pela criação de exceções do strptime.
+    
+    Returns:
+        datetime, ou None se não representar uma data/hora válida
+    """
+    if not (data_str.isascii() and data_str.isdigit() and hora_str.isascii() and hora_str.isdigit()):
+        return None
+    
+    if len(data_str) == 8 and len(hora_str) == 6:
+        dia, mes, ano = int(data_str[0:2]), int(data_str[2:4]), int(data_str[4:8])
+        hora, minuto, segundo = int(hora_str[0:2]), int(hora_str[2:4]), int(hora_str[4:6])
+        if not (1 <= mes <= 12 and 1 <= dia <= 31 and hora <= 23 and minuto <= 59 and segundo <= 59):
+            return None
+        try:
+            return datetime(ano, mes, dia, hora, minuto, segundo)
+        except ValueError:  # dia inexistente no mês (ex: 31/04)
+            return None
+    
+    # Larguras fora do padrão: mantém as regras de aceitação do strptime
+    try:
+        return datetime.strptime(data_str + "_" + hora_str, "%d%m%Y_%H%M%S")
+    except ValueError:
+        return None
 
 
 class FieldValidator(BaseValidator):
@@ -224,7 +283,7 @@ class FieldValidator(BaseValidator):
         # Se ambos válidos, cria datetime completo
         if data_str and hora_str and result.valid:
             try:
-                dt_combined = datetime.strptime(f"{data_str} {hora_str}", "%d/%m/%Y %H:%M")
+                dt_combined = parse_data_hora_br(f"{data_str} {hora_str}")
                 result.add_data('datetime_obj', dt_combined)
                 result.add_data('formatted_datetime', f"{data_str} {hora_str}")
                 
@@ -236,10 +295,8 @@ class FieldValidator(BaseValidator):
     
     def _validate_datetime_constraints(self, dt: datetime, result: ValidationResult, **kwargs):
         """Valida restrições adicionais de data/hora"""
-        import pytz
-        
         # Timezone Brasília
-        tz_brasilia = pytz.timezone("America/Campo_Grande")
+        tz_brasilia = TZ_BRASILIA
         agora = datetime.now(tz_brasilia)
         
         # Se deve ser no futuro
@@ -253,7 +310,6 @@ class FieldValidator(BaseValidator):
         if max_days:
             dt_tz = tz_brasilia.localize(dt)
             max_date = agora.replace(hour=23, minute=59, second=59)
-            from datetime import timedelta
             max_allowed = max_date + timedelta(days=max_days)
             
             if dt_tz > max_allowed:
@@ -269,7 +325,7 @@ class FieldValidator(BaseValidator):
         if reference_date:
             if isinstance(reference_date, str):
                 try:
-                    ref_dt = datetime.strptime(reference_date, "%d/%m/%Y %H:%M")
+                    ref_dt = parse_data_hora_br(reference_date)
                     if dt <= ref_dt:
                         result.add_error(
                             ValidationMessages.format_message(
@@ -414,7 +470,7 @@ class FieldValidator(BaseValidator):
             
             # Tenta criar datetime
             try:
-                dt_combined = datetime.strptime(f"{data_normalizada} {hora_normalizada}", "%d/%m/%Y %H:%M")
+                dt_combined = parse_data_hora_br(f"{data_normalizada} {hora_normalizada}")
                 result.add_data('datetime_obj', dt_combined)
                 result.add_data('formatted_datetime', f"{data_normalizada} {hora_normalizada}")
             except ValueError:
@@ -426,7 +482,7 @@ class FieldValidator(BaseValidator):
             if reference_date and reference_date.strip():
                 try:
                     if ' ' in reference_date:
-                        dt_referencia = datetime.strptime(reference_date.strip(), "%d/%m/%Y %H:%M")
+                        dt_referencia = parse_data_hora_br(reference_date.strip())
                     else:
                         dt_referencia = datetime.strptime(reference_date.strip(), "%d/%m/%Y")
                     
@@ -440,8 +496,7 @@ class FieldValidator(BaseValidator):
             # Validação de futuro
             must_be_future = kwargs.get('must_be_future', False)
             if must_be_future:
-                import pytz
-                agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+                agora = datetime.now(TZ_BRASILIA)
                 if dt_combined <= agora.replace(tzinfo=None):
                     result.add_error("Data/hora deve ser no futuro")
                     return result
@@ -449,10 +504,7 @@ class FieldValidator(BaseValidator):
             # Validação de limite máximo
             max_days_future = kwargs.get('max_days_future')
             if max_days_future:
-                import pytz
-                from datetime import timedelta
-                
-                agora = datetime.now(pytz.timezone("America/Campo_Grande"))
+                agora = datetime.now(TZ_BRASILIA)
                 max_allowed = agora + timedelta(days=max_days_future)
                 
                 if dt_combined > max_allowed.replace(tzinfo=None):
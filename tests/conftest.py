@@ -0,0 +1,10 @@
+"""
+Configuração comum dos testes - credenciais fictícias para carregar app.config
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("USERNAME_SP", "teste")
+os.environ.setdefault("PASSWORD_SP", "teste")
@@ -0,0 +1,77 @@
+"""
+Testes do parse vetorizado de datas de título do AutoStatusService
+"""
+import pandas as pd
+
+from app.services.auto_status_service import AutoStatusService
+
+
+def _datas(titulos):
+    return AutoStatusService._extrair_datas_dos_titulos(pd.Series(titulos)).tolist()
+
+
+def test_titulo_largura_padrao():
+    assert _datas(["RRP_Fabrica_N1_21072025_160000"]) == [pd.Timestamp(2025, 7, 21, 16)]
+
+
+def test_titulo_largura_reduzida_aceito_como_strptime():
+    # Mesma aceitação do strptime("%d%m%Y_%H%M%S") do parse escalar
+    assert _datas([
+        "RRP_Fabrica_N1_21072025_16000",
+        "RRP_Fabrica_N1_2172025_160000",
+    ]) == [
+        pd.Timestamp(2025, 7, 21, 16),
+        pd.Timestamp(2025, 7, 21, 16),
+    ]
+
+
+def test_titulo_invalido_sem_data():
+    assert all(pd.isna(d) for d in _datas([
+        "", "RRP_Fabrica", "RRP_Fabrica_N1_31022025_160000", "RRP_Fabrica_N1_21072025_246000",
+    ]))
+
+
+def test_largura_reduzida_expira_evento():
+    df = pd.DataFrame({
+        "Titulo": [
+            "RRP_Fabrica_N1_01012099_000000",
+            "RRP_Fabrica_N1_21072025_16000",
+            "RRP_Fabrica_N1_2172025_160000",
+        ],
+        "Criado": ["", "", ""],
+        "Status": ["Pendente", "Pendente", "Pendente"],
+    })
+    expirados = AutoStatusService.identificar_eventos_para_nao_tratado(df)
+    assert expirados.index.tolist() == [1, 2]
+
+
+def _criado_horas_atras(horas, sufixo=""):
+    """Criado ISO no horário de Brasília (sem timezone) ou em UTC (sufixo "Z")"""
+    agora = pd.Timestamp.now(tz="America/Campo_Grande")
+    if sufixo == "Z":
+        agora = agora.tz_convert("UTC")
+    return (agora - pd.Timedelta(hours=horas)).strftime("%Y-%m-%dT%H:%M:%S") + sufixo
+
+
+def test_criado_iso_sem_timezone_usa_horario_local():
+    # Sem timezone = horário de Brasília (não UTC): 1h atrás não expira
+    df = pd.DataFrame({
+        "Titulo": ["", ""],
+        "Criado": [_criado_horas_atras(1), _criado_horas_atras(3)],
+        "Status": ["Pendente", "Pendente"],
+    })
+    assert AutoStatusService.identificar_eventos_para_nao_tratado(df).index.tolist() == [1]
+
+
+def test_criado_iso_misto_com_e_sem_timezone():
+    df = pd.DataFrame({
+        "Titulo": ["", "", "", ""],
+        "Criado": [
+            _criado_horas_atras(1, "Z"),
+            _criado_horas_atras(3, "Z"),
+            _criado_horas_atras(1),
+            _criado_horas_atras(3),
+        ],
+        "Status": ["Pendente"] * 4,
+    })
+    assert AutoStatusService.identificar_eventos_para_nao_tratado(df).index.tolist() == [1, 3]